@@ -0,0 +1,72 @@
+import argparse
+import tracemalloc
+from collections import Counter, defaultdict
+from collections.abc import Iterator
+from random import Random
+from time import perf_counter
+from urllib.parse import parse_qsl
+
+from src.layers.python.helpers.uri_parser import UriParser
+
+
+SOURCES = ("google", "bing", "facebook", "newsletter", "twitter")
+MEDIUMS = ("cpc", "email", "social", "display")
+
+
+def generate_uris(size: int, seed: int = 42) -> Iterator[str]:
+    # NOTE: Ad-tech like URIs, i.e. a few low-cardinality keys (utm_*) and a unique click ID per URI.
+    random = Random(seed)
+    for index in range(size):
+        yield (
+            f"https://domain{index % 100}.tld/landing?utm_source={random.choice(SOURCES)}"
+            f"&utm_medium={random.choice(MEDIUMS)}&utm_campaign=campaign{random.randint(0, 500)}&gclid=id{index}"
+        )
+
+
+def _aggregate_exactly(parser: UriParser, uris: Iterator[str]) -> dict:
+    # NOTE: The baseline, i.e. parsing each URI into a dict and counting every distinct value of every key.
+    counts: dict[str, Counter] = defaultdict(Counter)
+    for uri in uris:
+        if not parser.is_valid(uri):
+            continue
+        query = parser.parse(uri)["query"]
+        for key, value in parse_qsl(query or "", keep_blank_values=True):
+            counts[key][value] += 1
+    return {
+        key: {"count": values.total(), "distinct": len(values), "top": values.most_common(10)}
+        for key, values in counts.items()
+    }
+
+
+def _aggregate_queries(parser: UriParser, uris: Iterator[str]) -> dict:
+    return parser.aggregate_queries(uris)
+
+
+def measure(aggregate, size: int) -> tuple[float, int, dict]:
+    # NOTE: The URIs are generated on the fly, so only what the aggregation holds on to is traced. The time is measured
+    #       without tracing, which would skew it.
+    tracemalloc.start()
+    try:
+        aggregate(UriParser(), generate_uris(size))
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    start = perf_counter()
+    result = aggregate(UriParser(), generate_uris(size))
+    return size / (perf_counter() - start), peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the query-string aggregation of a stream of URIs")
+    parser.add_argument("--size", type=int, default=100_000, help="The number of URIs to aggregate")
+    args = parser.parse_args()
+
+    print(f"{'method':<18} {'[uri/s]':>10} {'peak [MiB]':>11} {'gclid distinct':>15}")
+    for name, aggregate in (("exact counters", _aggregate_exactly), ("aggregate_queries", _aggregate_queries)):
+        throughput, peak, result = measure(aggregate=aggregate, size=args.size)
+        keys = result.get("keys", result)
+        print(f"{name:<18} {throughput:>10,.0f} {peak / 1024 / 1024:>11.1f} {keys['gclid']['distinct']:>15,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+from timeit import repeat
+
+from benchmarks.corpora import load_corpora
+from src.layers.python.helpers.uri_parser import FIELDS, UriParser
+
+
+def _parse_dicts_to_columns(parser: UriParser, uris: list[str]) -> dict[str, list]:
+    rows = [parser.parse(uri) if parser.is_valid(uri) else None for uri in uris]
+    return {name: [row[name] if row is not None else None for row in rows] for name in FIELDS}
+
+
+def measure(function, parser: UriParser, uris: list[str], number: int = 5, runs: int = 5) -> float:
+    best = min(repeat(lambda: function(parser, uris), number=number, repeat=runs))
+    return len(uris) * number / best
+
+
+def main():
+    corpus = [uri for uris in load_corpora().values() for uri in uris]
+    # NOTE: The same URIs often come back in a batch, hence the batch made of several copies of the corpus.
+    batches = {"distinct": corpus, "repeated": corpus * 4}
+    print(f"{'engine':<10} {'batch':<10} {'dicts [uri/s]':>15} {'columns [uri/s]':>16}")
+    for engine in ("urlparse", "rfc3986"):
+        parser = UriParser(engine=engine)
+        for batch_name, uris in batches.items():
+            dicts = measure(function=_parse_dicts_to_columns, parser=parser, uris=uris)
+            columns = measure(function=UriParser.parse_columns, parser=parser, uris=uris)
+            print(f"{engine:<10} {batch_name:<10} {dicts:>15,.0f} {columns:>16,.0f}")
+
+
+if __name__ == "__main__":
+    main()
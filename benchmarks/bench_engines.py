@@ -0,0 +1,57 @@
+import logging
+from timeit import repeat
+
+from benchmarks.corpora import load_corpora
+from src.layers.python.helpers.uri_parser import DifferentialEngine, ENGINES
+
+
+BASELINE_ENGINE = "urlparse"
+
+
+def _safe_parse(engine, uri: str) -> dict | None:
+    try:
+        return engine(uri)
+    except ValueError:
+        return None
+
+
+def measure(engine, corpus: list[str], number: int = 20, runs: int = 5) -> float:
+    best = min(repeat(lambda: [_safe_parse(engine, uri) for uri in corpus], number=number, repeat=runs))
+    return len(corpus) * number / best
+
+
+def compare(compared_engine: str, corpus: list[str]) -> DifferentialEngine:
+    # NOTE: As the differential mode does on a sample of the traffic, but for every URI of the corpus.
+    differential = DifferentialEngine(
+        engine=BASELINE_ENGINE,
+        compared_engine=compared_engine,
+        rate=1.0,
+        logger=logging.getLogger("bench_engines")
+    )
+    for uri in corpus:
+        _safe_parse(differential.parse, uri)
+    return differential
+
+
+def main():
+    logging.getLogger("bench_engines").disabled = True
+    names = list(ENGINES)
+    corpora = load_corpora()
+    print(f"{'corpus':<14}" + "".join(f" {name + ' [uri/s]':>20}" for name in names))
+    for corpus_name, corpus in corpora.items():
+        throughputs = [measure(ENGINES[name], corpus) for name in names]
+        print(f"{corpus_name:<14}" + "".join(f" {throughput:>20,.0f}" for throughput in throughputs))
+
+    compared_names = [name for name in names if name != BASELINE_ENGINE]
+    print()
+    print(f"{'corpus':<14}" + "".join(f" {name + ' disagreements':>26}" for name in compared_names))
+    for corpus_name, corpus in corpora.items():
+        differentials = [compare(compared_engine=name, corpus=corpus) for name in compared_names]
+        print(
+            f"{corpus_name:<14}"
+            + "".join(f" {differential.disagreements / len(corpus):>26.1%}" for differential in differentials)
+        )
+
+
+if __name__ == "__main__":
+    main()
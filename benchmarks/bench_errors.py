@@ -0,0 +1,54 @@
+import json
+import logging
+import os
+import sys
+from timeit import repeat
+
+# Inject helpers packages (in production this is done via Lambda layer):
+sys.path.append("src/layers/python/")
+
+# pylint: disable-next=wrong-import-position
+from helpers.sampled_logger import SampledLogger  # noqa: E402
+# pylint: disable-next=wrong-import-position
+import src.parse  # noqa: E402
+
+
+VALID_EVENT = {"body": json.dumps({"uri": "https://user@domain.tld:8080/path?key=value#fragment"})}
+INVALID_EVENT = {"body": json.dumps({"uri": "not a valid uri, but junk input"})}
+
+
+def measure(function, number: int = 2000, runs: int = 5) -> float:
+    best = min(repeat(function, number=number, repeat=runs))
+    return best / number * 1_000_000
+
+
+def _parse_valid_raising(uri: str) -> None:
+    try:
+        src.parse.uri_parser.parse_valid(uri=uri)
+    except ValueError:
+        pass
+
+
+def main():
+    # NOTE: The log records are still formatted and written (as in Lambda), but to /dev/null instead of stderr.
+    # pylint: disable-next=consider-using-with
+    logging.getLogger("uri-parser-rest-api").addHandler(logging.StreamHandler(open(os.devnull, "w", encoding="utf-8")))
+    sampled_logger = src.parse.error_logger
+    unlimited_logger = SampledLogger(logger=src.parse.logger, rate=1e9, burst=10 ** 9)
+    invalid_uri = json.loads(INVALID_EVENT["body"])["uri"]
+
+    print(f"{'path':<32} {'[us/request]':>13}")
+    for name, function in (
+        ("handler (valid)", lambda: src.parse.handler(VALID_EVENT, None)),
+        ("handler (invalid, sampled log)", lambda: src.parse.handler(INVALID_EVENT, None)),
+        ("handler (invalid, full log)", lambda: src.parse.handler(INVALID_EVENT, None)),
+        ("parse_valid (invalid, raising)", lambda: _parse_valid_raising(invalid_uri)),
+        ("try_parse_valid (invalid)", lambda: src.parse.uri_parser.try_parse_valid(uri=invalid_uri)),
+    ):
+        src.parse.error_logger = unlimited_logger if "full log" in name else sampled_logger
+        print(f"{name:<32} {measure(function):>13.1f}")
+    src.parse.error_logger = sampled_logger
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import tracemalloc
+from random import Random
+from time import perf_counter
+
+from src.layers.python.helpers.uri_parser import UriParser
+
+
+LINE_TEMPLATES = (
+    '{ip} - - [10/Oct/2000:13:55:36 -0700] "GET /path/{i}?key=value HTTP/1.1" 200 2326 "https://domain{i}.tld/start" '
+    '"Mozilla/5.0 (X11; Linux x86_64)"',
+    "{time} INFO Sent a notification to user{i}@domain.tld about http://domain.tld/items/{i} (took 12 ms)",
+    "{time} WARN Connection from {ip}:443 reset, retrying in 5 s",
+)
+
+
+def build_text(size: int, seed: int = 42) -> str:
+    random = Random(seed)
+    lines = []
+    length = 0
+    while length < size:
+        line = random.choice(LINE_TEMPLATES).format(
+            i=len(lines),
+            ip=".".join(str(random.randint(0, 255)) for _ in range(4)),
+            time=f"{random.randint(0, 23):02}:{random.randint(0, 59):02}:{random.randint(0, 59):02}"
+        )
+        lines.append(line)
+        length += len(line) + 1
+    return "\n".join(lines)
+
+
+def _extract_tokens(parser: UriParser, text: str) -> int:
+    # NOTE: The baseline, i.e. validating every whitespace-separated token (stripped of the usual punctuation).
+    return sum(1 for token in text.split() if parser.is_valid(token.strip("\"'()[],.;:")))
+
+
+def _extract(parser: UriParser, text: str) -> int:
+    return sum(1 for _ in parser.extract(text))
+
+
+def _extract_chunks(parser: UriParser, text: str) -> int:
+    return sum(1 for _ in parser.extract(text[start:start + 65536] for start in range(0, len(text), 65536)))
+
+
+def main():
+    text = build_text(size=1024 * 1024)
+    print(f"{'method':<16} {'found':>7} {'[MiB/s]':>8} {'peak [KiB]':>11}")
+    for name, function in (("tokens", _extract_tokens), ("extract", _extract), ("extract chunks", _extract_chunks)):
+        parser = UriParser()
+        start = perf_counter()
+        found = function(parser, text)
+        elapsed = perf_counter() - start
+        tracemalloc.start()
+        function(UriParser(), text)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{name:<16} {found:>7} {len(text) / elapsed / 1024 / 1024:>8.2f} {peak / 1024:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
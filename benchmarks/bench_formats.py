@@ -0,0 +1,44 @@
+import base64
+import json
+import logging
+import os
+import sys
+from timeit import repeat
+
+# Inject helpers packages (in production this is done via Lambda layer):
+sys.path.append("src/layers/python/")
+
+# pylint: disable-next=wrong-import-position
+from helpers.response_factory import negotiate_media_type  # noqa: E402
+# pylint: disable-next=wrong-import-position
+from src.parse import batch_handler  # noqa: E402
+
+
+URIS = [f"https://user@domain{index}.tld:8080/path/{index}?key=value&id={index}#fragment" for index in range(100)]
+FORMATS = ("application/json", "application/msgpack", "application/cbor", "text/csv")
+
+
+def measure(function, number: int = 200, runs: int = 5) -> float:
+    best = min(repeat(function, number=number, repeat=runs))
+    return best / number * 1_000
+
+
+def main():
+    # NOTE: The log records are still formatted and written (as in Lambda), but to /dev/null instead of stderr.
+    # pylint: disable-next=consider-using-with
+    logging.getLogger("uri-parser-rest-api").addHandler(logging.StreamHandler(open(os.devnull, "w", encoding="utf-8")))
+    body = json.dumps({"uris": URIS})
+
+    print(f"{'format':<24} {'[ms/batch]':>11} {'body [B]':>9}")
+    for media_type in FORMATS:
+        if negotiate_media_type(media_type) != media_type:
+            print(f"{media_type:<24} {'(package not installed)':>21}")
+            continue
+        event = {"body": body, "headers": {"Accept": media_type}, "queryStringParameters": {"pretty": "false"}}
+        response = batch_handler(event, None)
+        size = len(base64.b64decode(response["body"])) if response.get("isBase64Encoded") else len(response["body"])
+        print(f"{media_type:<24} {measure(lambda event=event: batch_handler(event, None)):>11.3f} {size:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import argparse
+import random
+import string
+from ipaddress import IPv4Address
+from time import perf_counter
+from timeit import repeat
+
+from src.layers.python.helpers.host_lists import HostLists
+
+
+SIZES = (1000, 10000, 100000, 1000000)
+TLDS = ("com", "net", "org", "io", "de", "co.uk")
+LOOKUPS = 1000
+
+
+def _random_domain(rng: random.Random) -> str:
+    label = "".join(rng.choices(string.ascii_lowercase + string.digits, k=rng.randint(5, 15)))
+    return f"{label}.{rng.choice(TLDS)}"
+
+
+def build_lists(size: int, rng: random.Random) -> tuple[HostLists, list[str], list[str]]:
+    domains = [_random_domain(rng) for _ in range(size)]
+    networks = [f"{IPv4Address(rng.getrandbits(32) & 0xFFFFFF00)}/24" for _ in range(size)]
+    host_lists = HostLists({"blocked": {"domains": domains, "networks": networks}})
+    # NOTE: Half of the looked up hosts are (subdomains of) listed domains, the other half are not.
+    hosts = [f"www.sub.{rng.choice(domains)}" for _ in range(LOOKUPS // 2)]
+    hosts += [f"www.sub.{_random_domain(rng)}" for _ in range(LOOKUPS // 2)]
+    addresses = [network.split("/")[0].replace(".0", ".1", 1) for network in rng.sample(networks, LOOKUPS // 2)]
+    addresses += [str(IPv4Address(rng.getrandbits(32))) for _ in range(LOOKUPS // 2)]
+    return host_lists, hosts, addresses
+
+
+def measure(host_lists: HostLists, hosts: list[str], number: int = 20, runs: int = 5) -> float:
+    best = min(repeat(lambda: [host_lists.match(host=host) for host in hosts], number=number, repeat=runs))
+    return best / (number * len(hosts)) * 1e9
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Measure the host lists lookup cost against the lists size")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="The numbers of domains and networks")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(42)
+    print(f"{'entries':>10} {'build [s]':>10} {'domain [ns/op]':>15} {'ip [ns/op]':>12}")
+    for size in args.sizes:
+        start = perf_counter()
+        host_lists, hosts, addresses = build_lists(size=size, rng=rng)
+        build_time = perf_counter() - start
+        print(
+            f"{size:>10} {build_time:>10.2f} {measure(host_lists, hosts):>15.0f} "
+            f"{measure(host_lists, addresses):>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import argparse
+import json
+import tracemalloc
+from time import perf_counter
+
+from benchmarks.corpora import load_corpora
+from src.layers.python.helpers.uri_parser import ParsedUri, UriParser
+
+
+def _parse_dicts(parser: UriParser, uris: list[str]) -> list:
+    return [parser.parse(uri) for uri in uris]
+
+
+def _parse_compact(parser: UriParser, uris: list[str]) -> list:
+    return [parser.parse_compact(uri) for uri in uris]
+
+
+def measure(parse, parser: UriParser, uris: list[str]) -> tuple[int, float, float]:
+    # NOTE: The URIs are allocated before tracing, so only what the results hold on to is measured. The times are
+    #       measured without tracing, which would skew them.
+    tracemalloc.start()
+    try:
+        results = parse(parser, uris)
+        retained = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del results
+    start = perf_counter()
+    results = parse(parser, uris)
+    parse_time = perf_counter() - start
+    start = perf_counter()
+    for result in results:
+        if isinstance(result, ParsedUri):
+            result.to_json()
+        else:
+            json.dumps(result, separators=(",", ":"), ensure_ascii=False)
+    return retained, parse_time, perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the memory held by parsed URIs")
+    parser.add_argument("--size", type=int, default=1_000_000, help="The number of URIs to parse")
+    args = parser.parse_args()
+
+    corpus = [uri for uris in load_corpora().values() for uri in uris]
+    # NOTE: Distinct strings (i.e. not the same corpus entries over and over), as in a real batch.
+    uris = [f"{corpus[i % len(corpus)]}{i}" for i in range(args.size)]
+    engines = [UriParser(engine=engine) for engine in ("urlparse", "rfc3986")]
+    uris = [uri for uri in uris if all(_is_parsable(parser=engine, uri=uri) for engine in engines)]
+    print(f"{'results':<24} {'retained [MiB]':>15} {'[B/uri]':>8} {'parse [s]':>10} {'json [s]':>9}")
+    for name, engine, parse in (
+        ("dict (urlparse)", "urlparse", _parse_dicts),
+        ("dict (rfc3986)", "rfc3986", _parse_dicts),
+        ("ParsedUri", "rfc3986", _parse_compact),
+    ):
+        retained, parse_time, json_time = measure(parse=parse, parser=UriParser(engine=engine), uris=uris)
+        print(
+            f"{name:<24} {retained / 1024 / 1024:>15.1f} {retained / len(uris):>8.0f}"
+            f" {parse_time:>10.2f} {json_time:>9.2f}"
+        )
+
+
+def _is_parsable(parser: UriParser, uri: str) -> bool:
+    try:
+        parser.parse(uri)
+        return True
+    except ValueError:
+        return False
+
+
+if __name__ == "__main__":
+    main()
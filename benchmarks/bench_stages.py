@@ -0,0 +1,118 @@
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from timeit import Timer
+
+# Mimic the production configuration (see serverless.yml), but without cache so that each stage is actually measured:
+os.environ["PRETTY_RESPONSES"] = "false"
+os.environ["URI_PARSER_CACHE_SIZE"] = "0"
+
+# Inject helpers packages (in production this is done via Lambda layer):
+sys.path.append("src/layers/python/")
+
+# pylint: disable=wrong-import-position
+from helpers.request_parsers import get_request_body  # noqa: E402
+from helpers.response_factory import build_response  # noqa: E402
+from helpers.uri_parser import UriParser  # noqa: E402
+from benchmarks.corpora import load_corpora  # noqa: E402
+from src.parse import handler  # noqa: E402
+# pylint: enable=wrong-import-position
+
+
+def _silence_handler_logs():
+    # NOTE: The log records are still formatted and written (as in Lambda), but to /dev/null instead of stderr.
+    # pylint: disable-next=consider-using-with
+    logging.getLogger("uri-parser-rest-api").addHandler(logging.StreamHandler(open(os.devnull, "w", encoding="utf-8")))
+
+
+def _safe_parse(uri_parser: UriParser, uri: str) -> dict | None:
+    try:
+        return uri_parser.parse(uri)
+    except ValueError:
+        return None
+
+
+def build_stages(corpus: list[str]) -> dict:
+    uri_parser = UriParser()
+    events = [{"body": json.dumps({"uri": uri})} for uri in corpus]
+    parsed = [_safe_parse(uri_parser, uri) or {"raw": uri} for uri in corpus]
+    return {
+        "get_request_body": lambda: [get_request_body(event=event) for event in events],
+        "is_valid": lambda: [uri_parser.is_valid(uri) for uri in corpus],
+        "parse": lambda: [_safe_parse(uri_parser, uri) for uri in corpus],
+        "build_response": lambda: [build_response(status=200, body=info) for info in parsed],
+        "handler": lambda: [handler(event, None) for event in events],
+    }
+
+
+def measure(function, size: int, runs: int, min_time: float) -> dict:
+    timer = Timer(function)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    timings = sorted(timer.repeat(repeat=runs, number=number))
+    return {
+        "ns_per_op_min": timings[0] / (number * size) * 1e9,
+        "ns_per_op_median": timings[len(timings) // 2] / (number * size) * 1e9,
+        "ops": number * size * runs,
+    }
+
+
+def get_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark each stage of the URI parsing, on several corpora")
+    parser.add_argument("-o", "--output", help="The JSON file to write the results to")
+    parser.add_argument("--runs", type=int, default=5, help="The number of runs per stage (the minimum is kept)")
+    parser.add_argument("--min-time", type=float, default=0.2, help="The minimum duration of a single run, in seconds")
+    parser.add_argument("--stage", action="append", help="Run only the given stage(s)")
+    parser.add_argument("--corpus", action="append", help="Run only on the given corpus(es)")
+    args = parser.parse_args(argv)
+
+    _silence_handler_logs()
+    results = []
+    print(f"{'stage':<18} {'corpus':<14} {'min [ns/op]':>12} {'median [ns/op]':>15}")
+    for corpus_name, corpus in load_corpora().items():
+        if args.corpus and corpus_name not in args.corpus:
+            continue
+        for stage, function in build_stages(corpus).items():
+            if args.stage and stage not in args.stage:
+                continue
+            result = {"stage": stage, "corpus": corpus_name, **measure(function, len(corpus), args.runs, args.min_time)}
+            results.append(result)
+            print(f"{stage:<18} {corpus_name:<14} {result['ns_per_op_min']:>12.0f} {result['ns_per_op_median']:>15.0f}")
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "commit": get_commit(),
+                    "date": datetime.now(timezone.utc).isoformat(),
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "cpu_count": os.cpu_count(),
+                    "results": results,
+                },
+                file,
+                indent=4
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
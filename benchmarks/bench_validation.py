@@ -0,0 +1,32 @@
+from timeit import repeat
+import validators
+
+from benchmarks.corpora import load_corpora
+from src.layers.python.helpers.uri_parser import UriParser
+
+
+def chained_is_valid(uri: str) -> bool:
+    return bool(
+        validators.url(uri) or
+        validators.ip_address.ipv4(uri) or
+        validators.ip_address.ipv6(uri) or
+        validators.email(uri)
+    )
+
+
+def measure(function, corpus: list[str], number: int = 200, runs: int = 5) -> float:
+    best = min(repeat(lambda: [function(uri) for uri in corpus], number=number, repeat=runs))
+    return best / (number * len(corpus)) * 1e6
+
+
+def main():
+    uri_parser = UriParser()
+    print(f"{'corpus':<14} {'chained [us/uri]':>18} {'classify [us/uri]':>18} {'speedup':>8}")
+    for name, corpus in load_corpora().items():
+        chained = measure(chained_is_valid, corpus, number=5)
+        classified = measure(uri_parser.is_valid, corpus, number=5)
+        print(f"{name:<14} {chained:>18.2f} {classified:>18.2f} {chained / classified:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+import argparse
+import json
+import sys
+
+
+def load_results(path: str) -> dict[tuple[str, str], float]:
+    with open(path, encoding="utf-8") as file:
+        report = json.load(file)
+    return {(result["stage"], result["corpus"]): result["ns_per_op_min"] for result in report["results"]}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two benchmark results written by benchmarks.bench_stages")
+    parser.add_argument("baseline", help="The baseline JSON results")
+    parser.add_argument("current", help="The current JSON results")
+    parser.add_argument("--threshold", type=float, default=1.10, help="The slowdown ratio considered a regression")
+    args = parser.parse_args(argv)
+
+    baseline = load_results(args.baseline)
+    current = load_results(args.current)
+    regressions = 0
+    print(f"{'stage':<18} {'corpus':<14} {'baseline [ns/op]':>17} {'current [ns/op]':>16} {'ratio':>7}")
+    for key in sorted(baseline.keys() & current.keys()):
+        ratio = current[key] / baseline[key]
+        flag = ""
+        if ratio > args.threshold:
+            regressions += 1
+            flag = " REGRESSION"
+        print(f"{key[0]:<18} {key[1]:<14} {baseline[key]:>17.0f} {current[key]:>16.0f} {ratio:>6.2f}x{flag}")
+    return 1 if regressions > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
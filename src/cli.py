@@ -0,0 +1,96 @@
+import argparse
+import csv
+import fileinput
+import json
+import os
+import sys
+from collections.abc import Iterator
+from contextlib import nullcontext
+from helpers.parallel import parse_many
+
+
+CSV_FIELDS = (
+    "uri",
+    "status",
+    "error",
+    "message",
+    "fragment",
+    "host",
+    "port",
+    "path",
+    "query",
+    "raw",
+    "scheme",
+    "userinfo",
+    "kind",
+)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    rows = parse_many(
+        uris=_read_uris(files=args.files),
+        force=args.force,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        ordered=args.ordered
+    )
+    with _open_output(path=args.output) as output:
+        if args.format == "csv":
+            _write_csv(rows=rows, output=output)
+        else:
+            _write_jsonl(rows=rows, output=output)
+    return 0
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Parse the URIs in the given files (one per line)")
+    parser.add_argument("files", nargs="*", help="The files to read the URIs from (default: stdin)")
+    parser.add_argument("-o", "--output", default="-", help="The file to write the results to (default: stdout)")
+    parser.add_argument("-f", "--format", choices=("jsonl", "csv"), default="jsonl", help="The output format")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1, help="The number of processes")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="The number of URIs sent to a process at once")
+    parser.add_argument("--force", action="store_true", help="Parse the URIs even if not recognized as valid")
+    parser.add_argument(
+        "--unordered",
+        dest="ordered",
+        action="store_false",
+        help="Write the results as soon as they are ready, instead of in input order"
+    )
+    return parser.parse_args(argv)
+
+
+def _open_output(path: str):
+    if path == "-":
+        return nullcontext(sys.stdout)
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def _read_uris(files: list[str]) -> Iterator[str]:
+    with fileinput.input(files=files or ("-",), encoding="utf-8") as lines:
+        for line in lines:
+            uri = line.strip()
+            if uri:
+                yield uri
+
+
+def _write_jsonl(rows: Iterator[dict], output) -> None:
+    for row in rows:
+        output.write(json.dumps(row, separators=(",", ":"), ensure_ascii=False))
+        output.write("\n")
+
+
+def _write_csv(rows: Iterator[dict], output) -> None:
+    writer = csv.DictWriter(output, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow({
+            "uri": row["uri"],
+            "status": row["status"],
+            **row.get("error", {}),
+            **row.get("result", {}),
+        })
+
+
+if __name__ == "__main__":
+    sys.exit(main())
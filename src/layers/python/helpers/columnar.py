@@ -0,0 +1,49 @@
+from array import array
+from importlib import import_module
+from types import ModuleType
+
+
+BOOLEAN_COLUMNS = ("valid",)
+STRING_COLUMNS = ("raw", "kind", "fragment", "host", "path", "query", "scheme", "userinfo")
+
+
+def to_numpy(columns: dict[str, list | array]) -> dict:
+    # NOTE: The strings are kept as objects (i.e. None for nulls), while the ports are a masked array over the buffer of
+    #       the 32-bit integers, without any copy.
+    numpy = _import_optional("numpy")
+    arrays = {name: numpy.array(columns[name], dtype=bool) for name in BOOLEAN_COLUMNS}
+    arrays.update({name: numpy.array(columns[name], dtype=object) for name in STRING_COLUMNS})
+    arrays["port"] = numpy.ma.masked_array(
+        numpy.frombuffer(columns["port"], dtype=numpy.int32),
+        mask=numpy.array(columns["port_null"], dtype=bool)
+    )
+    return arrays
+
+
+def to_arrow(columns: dict[str, list | array]):
+    pyarrow = _import_optional("pyarrow")
+    arrays = {name: pyarrow.array(columns[name], type=pyarrow.bool_()) for name in BOOLEAN_COLUMNS}
+    arrays.update({name: pyarrow.array(columns[name], type=pyarrow.string()) for name in STRING_COLUMNS})
+    arrays["port"] = pyarrow.array(
+        [None if null else port for port, null in zip(columns["port"], columns["port_null"])],
+        type=pyarrow.int32()
+    )
+    return pyarrow.table(arrays)
+
+
+def write_parquet(columns: dict[str, list | array], path: str) -> None:
+    parquet = _import_optional("pyarrow.parquet")
+    parquet.write_table(to_arrow(columns), path)
+
+
+def write_ipc(columns: dict[str, list | array], path: str) -> None:
+    feather = _import_optional("pyarrow.feather")
+    feather.write_feather(to_arrow(columns), path, compression="uncompressed")
+
+
+def _import_optional(name: str) -> ModuleType:
+    # NOTE: numpy and pyarrow are not dependencies (i.e. not in the Lambda layer), so they are only imported on demand.
+    try:
+        return import_module(name)
+    except ImportError as error:
+        raise ImportError(f"The '{name.partition('.')[0]}' package is required for this output!") from error
@@ -0,0 +1,150 @@
+import json
+from bisect import bisect_right
+from collections.abc import Iterable
+from ipaddress import ip_network, IPv4Address, IPv6Address
+from socket import AF_INET, AF_INET6, inet_pton
+
+
+TERMINAL = ""
+
+
+class DomainTrie:
+    # NOTE: The domains are indexed by their reversed labels (e.g. "tld" -> "domain" -> "sub"), so that a lookup costs
+    #       one dict access per label of the host, whatever the number of domains. To save memory, a node without
+    #       children is stored as the tuple of its list names, instead of a dict holding them under the TERMINAL key.
+    def __init__(self):
+        self._root: dict = {}
+        self._size = 0
+
+    def add(self, domain: str, names: tuple[str, ...]) -> None:
+        # NOTE: The hosts are looked up IDNA-encoded (see "normalized_host"), so the domains are indexed the same way.
+        domain = _normalize_domain(domain)
+        try:
+            domain = domain.encode("idna").decode("ascii")
+        except UnicodeError:
+            pass
+        labels = domain.split(".")[::-1]
+        node = self._root
+        for label in labels[:-1]:
+            child = node.get(label)
+            if not isinstance(child, dict):
+                child = node[label] = {TERMINAL: child} if child is not None else {}
+            node = child
+        child = node.get(labels[-1])
+        if isinstance(child, dict):
+            child[TERMINAL] = _merge(child.get(TERMINAL), names)
+        else:
+            node[labels[-1]] = _merge(child, names)
+        self._size += 1
+
+    def match(self, domain: str) -> set[str]:
+        # NOTE: A domain matches itself and all its subdomains.
+        names = set()
+        node = self._root
+        for label in reversed(domain.split(".")):
+            node = node.get(label)
+            if node is None:
+                break
+            if not isinstance(node, dict):
+                names.update(node)
+                break
+            names.update(node.get(TERMINAL, ()))
+        return names
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class IpRanges:
+    # NOTE: The networks are merged into sorted, non-overlapping ranges, so that a lookup is a binary search.
+    def __init__(self, networks: Iterable[str]):
+        ranges = {4: [], 6: []}
+        for network in networks:
+            network = ip_network(network, strict=False)
+            ranges[network.version].append((int(network.network_address), int(network.broadcast_address)))
+        self._starts: dict[int, list[int]] = {}
+        self._ends: dict[int, list[int]] = {}
+        for version, version_ranges in ranges.items():
+            merged: list[list[int]] = []
+            for start, end in sorted(version_ranges):
+                if merged and start <= merged[-1][1] + 1:
+                    merged[-1][1] = max(merged[-1][1], end)
+                else:
+                    merged.append([start, end])
+            self._starts[version] = [start for start, _ in merged]
+            self._ends[version] = [end for _, end in merged]
+
+    def contains(self, version: int, value: int) -> bool:
+        index = bisect_right(self._starts[version], value) - 1
+        return index >= 0 and value <= self._ends[version][index]
+
+    def __contains__(self, address: IPv4Address | IPv6Address) -> bool:
+        return self.contains(version=address.version, value=int(address))
+
+    def __len__(self) -> int:
+        return len(self._starts[4]) + len(self._starts[6])
+
+
+class HostLists:
+    def __init__(self, lists: dict[str, dict[str, list[str]]]):
+        self.names = tuple(lists)
+        self.domains = DomainTrie()
+        self.networks: dict[str, IpRanges] = {}
+        self.query_keys: dict[str, tuple[str, ...]] = {}
+        for name, entries in lists.items():
+            for domain in entries.get("domains", ()):
+                self.domains.add(domain, names=(name,))
+            if entries.get("networks"):
+                self.networks[name] = IpRanges(entries["networks"])
+            for key in entries.get("query_keys", ()):
+                self.query_keys[key] = _merge(self.query_keys.get(key), (name,))
+
+    def match(self, host: str | None, query_keys: Iterable[str] = ()) -> list[str]:
+        names = set()
+        if host:
+            address = _get_address(host)
+            if address is None:
+                names.update(self.domains.match(_normalize_domain(host)))
+            else:
+                names.update(name for name, ranges in self.networks.items() if ranges.contains(*address))
+        for key in query_keys:
+            names.update(self.query_keys.get(key, ()))
+        return [name for name in self.names if name in names]
+
+    def stats(self) -> dict:
+        return {
+            "lists": len(self.names),
+            "domains": len(self.domains),
+            "networks": sum(len(ranges) for ranges in self.networks.values()),
+            "query_keys": len(self.query_keys),
+        }
+
+
+def load_host_lists(path: str) -> HostLists:
+    with open(path, encoding="utf-8") as file:
+        return HostLists(json.load(file))
+
+
+def _get_address(host: str) -> tuple[int, int] | None:
+    # NOTE: A domain never ends with a digit (i.e. a TLD is never numeric), so only what may be an IP is parsed as such.
+    #       The (version, value) pair is computed via inet_pton, which is an order of magnitude faster than ip_address.
+    if ":" in host:
+        version, family = 6, AF_INET6
+    elif host[-1].isdigit():
+        version, family = 4, AF_INET
+    else:
+        return None
+    try:
+        return version, int.from_bytes(inet_pton(family, host), "big")
+    except (OSError, ValueError):
+        return None
+
+
+def _normalize_domain(domain: str) -> str:
+    return domain.rstrip(".").lower()
+
+
+def _merge(names: tuple[str, ...] | None, new_names: tuple[str, ...]) -> tuple[str, ...]:
+    if names is None:
+        return new_names
+    return names + tuple(name for name in new_names if name not in names)
@@ -0,0 +1,63 @@
+import json
+import sys
+from contextlib import contextmanager, nullcontext
+from time import perf_counter, time
+from typing import TextIO
+
+
+NULL_TIMER = nullcontext()
+
+
+class Metrics:
+    def __init__(self, namespace: str = "uri-parser-rest-api", enabled: bool = False, output: TextIO | None = None):
+        self.namespace = namespace
+        self.enabled = enabled
+        self.output = output
+        self._values: dict[str, float] = {}
+        self._units: dict[str, str] = {}
+
+    def timer(self, name: str):
+        # NOTE: When disabled, the same no-op context manager is always returned, so that timing costs next to nothing.
+        if not self.enabled:
+            return NULL_TIMER
+        return self._timer(name)
+
+    def increment(self, name: str, value: int = 1) -> None:
+        if not self.enabled:
+            return
+        self._add(name=name, value=value, unit="Count")
+
+    def flush(self, dimensions: dict[str, str] | None = None) -> None:
+        if not self.enabled or not self._values:
+            return
+        dimensions = dimensions or {}
+        record = {
+            "_aws": {
+                "Timestamp": int(time() * 1000),
+                "CloudWatchMetrics": [
+                    {
+                        "Namespace": self.namespace,
+                        "Dimensions": [list(dimensions.keys())],
+                        "Metrics": [{"Name": name, "Unit": unit} for name, unit in self._units.items()],
+                    }
+                ],
+            },
+            **dimensions,
+            **self._values,
+        }
+        output = self.output or sys.stdout
+        output.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._values.clear()
+        self._units.clear()
+
+    @contextmanager
+    def _timer(self, name: str):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self._add(name=name, value=(perf_counter() - start) * 1000, unit="Milliseconds")
+
+    def _add(self, name: str, value: float, unit: str) -> None:
+        self._values[name] = self._values.get(name, 0) + value
+        self._units[name] = unit
@@ -0,0 +1,74 @@
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, as_completed, wait
+from itertools import islice
+from .response_factory import build_error_body
+from .uri_parser import INVALID_URI_MESSAGE, UriParser
+
+
+def parse_many(
+    uris: Iterable[str],
+    force: bool = False,
+    workers: int = 1,
+    chunk_size: int = 1000,
+    ordered: bool = True
+) -> Iterator[dict]:
+    chunks = _chunked(uris=uris, chunk_size=chunk_size)
+    if workers <= 1:
+        for chunk in chunks:
+            yield from _parse_chunk(chunk=chunk, force=force)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # NOTE: Only a few chunks per worker are in flight at any time, so that the input is never read all at once.
+        submitted = (executor.submit(_parse_chunk, chunk=chunk, force=force) for chunk in chunks)
+        max_pending = workers * 2
+        if ordered:
+            yield from _collect_ordered(futures=submitted, max_pending=max_pending)
+        else:
+            yield from _collect_unordered(futures=submitted, max_pending=max_pending)
+
+
+def parse_item(uri_parser: UriParser, uri: str, force: bool = False) -> dict:
+    try:
+        info = uri_parser.try_parse_valid(uri=uri, force=force)
+        if info is None:
+            return {"uri": uri, "status": 400, "error": build_error_body(status=400, message=INVALID_URI_MESSAGE + uri)}
+        return {"uri": uri, "status": 200, "result": info}
+    except ValueError as error:
+        return {"uri": uri, "status": 400, "error": build_error_body(status=400, message=str(error))}
+    except Exception as error:
+        return {"uri": uri, "status": 500, "error": build_error_body(status=500, message=str(error))}
+
+
+def _chunked(uris: Iterable[str], chunk_size: int) -> Iterator[list[str]]:
+    iterator = iter(uris)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+
+def _parse_chunk(chunk: list[str], force: bool) -> list[dict]:
+    uri_parser = UriParser()
+    return [parse_item(uri_parser=uri_parser, uri=uri, force=force) for uri in chunk]
+
+
+def _collect_ordered(futures: Iterator[Future], max_pending: int) -> Iterator[dict]:
+    pending: deque[Future] = deque()
+    for future in futures:
+        pending.append(future)
+        if len(pending) >= max_pending:
+            yield from pending.popleft().result()
+    while pending:
+        yield from pending.popleft().result()
+
+
+def _collect_unordered(futures: Iterator[Future], max_pending: int) -> Iterator[dict]:
+    pending: set[Future] = set()
+    for future in futures:
+        pending.add(future)
+        if len(pending) >= max_pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for done_future in done:
+                yield from done_future.result()
+    for done_future in as_completed(pending):
+        yield from done_future.result()
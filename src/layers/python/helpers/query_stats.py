@@ -0,0 +1,138 @@
+from hashlib import blake2b
+from math import log
+from urllib.parse import parse_qsl
+
+
+HASH_SIZE = 8
+HASH_BITS = HASH_SIZE * 8
+
+
+class HyperLogLog:
+    # NOTE: A distinct count estimate in a fixed memory (i.e. one byte per register, 4 KiB by default), whatever the
+    #       number of values added. The standard error is about 1.04 / sqrt(2 ** precision), i.e. 1.6% by default.
+    def __init__(self, precision: int = 12):
+        if not 4 <= precision <= 16:
+            raise ValueError(f"Invalid HyperLogLog precision: {precision}")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value: str) -> None:
+        # NOTE: A stable hash (unlike the builtin one, which is salted per process), so that the estimates of different
+        #       containers can be merged.
+        hashed = int.from_bytes(blake2b(value.encode("utf-8", "surrogatepass"), digest_size=HASH_SIZE).digest(), "big")
+        index = hashed >> (HASH_BITS - self.precision)
+        bits = HASH_BITS - self.precision
+        rank = bits - (hashed & ((1 << bits) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLogs of different precisions!")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def count(self) -> int:
+        size = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size * size / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        # NOTE: The small cardinalities are better estimated by linear counting (i.e. from the empty registers).
+        if estimate <= 2.5 * size and zeros:
+            estimate = size * log(size / zeros)
+        return round(estimate)
+
+
+class TopValues:
+    # NOTE: The most frequent values among a bounded number of counters (i.e. the "space-saving" algorithm): a new value
+    #       starts from the highest count evicted so far, which is its maximum error, while any value more frequent
+    #       than 1 / capacity of the total is guaranteed to be kept. The least frequent values are evicted in batches
+    #       (i.e. whenever twice the capacity is reached), so that a stream of distinct values (e.g. click IDs) does not
+    #       cost a scan of all the counters for each one.
+    def __init__(self, capacity: int = 100):
+        if capacity <= 0:
+            raise ValueError(f"Invalid top values capacity: {capacity}")
+        self.capacity = capacity
+        self._floor = 0
+        self._counts: dict[str, int] = {}
+        self._errors: dict[str, int] = {}
+
+    def add(self, value: str) -> None:
+        counts = self._counts
+        count = counts.get(value)
+        if count is not None:
+            counts[value] = count + 1
+            return
+        if len(counts) >= 2 * self.capacity:
+            kept = sorted(counts.items(), key=lambda item: item[1], reverse=True)
+            self._floor = kept[self.capacity][1]
+            self._counts = counts = dict(kept[:self.capacity])
+            self._errors = {value: error for value, error in self._errors.items() if value in counts}
+        counts[value] = self._floor + 1
+        if self._floor:
+            self._errors[value] = self._floor
+
+    def top(self, size: int) -> list[tuple[str, int, int]]:
+        # NOTE: Ranked by their guaranteed count (i.e. without their error), so that the values which only got in late
+        #       (e.g. the last of many distinct ones) do not outrank those actually counted.
+        items = ((value, count, self._errors.get(value, 0)) for value, count in self._counts.items())
+        return sorted(items, key=lambda item: (item[2] - item[1], -item[1], item[0]))[:size]
+
+
+class KeyStats:  # pylint: disable=too-few-public-methods
+    __slots__ = ("count", "distinct", "values")
+
+    def __init__(self, precision: int, capacity: int):
+        self.count = 0
+        self.distinct = HyperLogLog(precision=precision)
+        self.values = TopValues(capacity=capacity)
+
+    def add(self, value: str) -> None:
+        self.count += 1
+        self.distinct.add(value)
+        self.values.add(value)
+
+
+class QueryStats:
+    # NOTE: The statistics of the query parameters across any number of queries, in a memory bounded by the number of
+    #       keys tracked (i.e. at most "max_keys", the occurrences of any other key only being counted as a whole).
+    def __init__(self, top: int = 10, max_keys: int = 256, precision: int = 12):
+        if top <= 0:
+            raise ValueError(f"Invalid top size: {top}")
+        if max_keys <= 0:
+            raise ValueError(f"Invalid maximum number of keys: {max_keys}")
+        self.top = top
+        self.max_keys = max_keys
+        self.precision = precision
+        self.queries = 0
+        self.other_keys = 0
+        self._keys: dict[str, KeyStats] = {}
+
+    def add(self, query: str) -> None:
+        self.queries += 1
+        for key, value in parse_qsl(query, keep_blank_values=True):
+            stats = self._keys.get(key)
+            if stats is None:
+                if len(self._keys) >= self.max_keys:
+                    self.other_keys += 1
+                    continue
+                # NOTE: Ten times more counters than reported, so that the top values are (nearly always) exact.
+                stats = self._keys[key] = KeyStats(precision=self.precision, capacity=self.top * 10)
+            stats.add(value)
+
+    def to_dict(self) -> dict:
+        keys = sorted(self._keys.items(), key=lambda item: (-item[1].count, item[0]))
+        return {
+            "queries": self.queries,
+            "keys": {
+                key: {
+                    "count": stats.count,
+                    "distinct": stats.distinct.count(),
+                    "top": [
+                        {"value": value, "count": count, "error": error}
+                        for value, count, error in stats.values.top(self.top)
+                    ],
+                }
+                for key, stats in keys
+            },
+            "other_keys": self.other_keys,
+        }
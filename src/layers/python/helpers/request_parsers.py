@@ -1,7 +1,26 @@
+import codecs
 import json
+from binascii import Error as Base64Error
+from base64 import b64decode
+from collections.abc import Iterator
 from json import JSONDecodeError
 
 
+class BodyTooLargeError(ValueError):
+    pass
+
+
+def get_header(event: dict | None, name: str, default: str | None = None) -> str | None:
+    headers = event.get("headers", {}) if event is not None else {}
+    if headers is None:
+        return default
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return default
+
+
 def get_path_parameter(event: dict | None, name: str, default: str | None = None) -> str | None:
     parameters = event.get("pathParameters", {}) if event is not None else {}
     return parameters.get(name, default) if parameters is not None else default
@@ -12,9 +31,105 @@ def get_query_string(event: dict | None, name: str, default: str | None = None)
     return parameters.get(name, default) if parameters is not None else default
 
 
-def get_request_body(event: dict | None, default: str = "{}") -> dict:
+def get_request_body(event: dict | None, default: str = "{}", max_size: int | None = None) -> dict:
+    body = _get_body(event=event, default=default, max_size=max_size)
     try:
-        body = event.get("body", default) if event is not None else default
         return json.loads(body) if body is not None else {}
     except JSONDecodeError as error:
-        raise ValueError(f"Failed to parse '{event}' body from request!") from error
+        raise ValueError(f"Failed to parse body from request: {error.msg} (at position {error.pos})!") from error
+    except UnicodeDecodeError as error:
+        raise ValueError("Failed to parse body from request: not a valid UTF-8 text!") from error
+
+
+def get_request_text(event: dict | None, default: str = "", max_size: int | None = None) -> str:
+    body = _get_body(event=event, default=default, max_size=max_size)
+    if body is None:
+        return ""
+    try:
+        return str(body, "utf-8") if isinstance(body, bytes) else body
+    except UnicodeDecodeError as error:
+        raise ValueError("Failed to parse body from request: not a valid UTF-8 text!") from error
+
+
+def get_request_lines(event: dict | None, default: str = "", max_size: int | None = None) -> Iterator[str]:
+    body = _get_body(event=event, default=default, max_size=max_size)
+    if body is None:
+        return
+    # NOTE: Lines are sliced one at a time (instead of using splitlines), so that they are never all in memory at once.
+    #       A decoded base64 body is sliced via a memoryview, so that each line is decoded without copying its bytes.
+    if isinstance(body, bytes):
+        view = memoryview(body)
+        for start, end in _get_line_bounds(body=body, newline=b"\n"):
+            yield str(view[start:end], "utf-8", errors="replace").rstrip("\r")
+    else:
+        for start, end in _get_line_bounds(body=body, newline="\n"):
+            yield body[start:end].rstrip("\r")
+
+
+def get_request_chunks(
+    event: dict | None,
+    default: str = "",
+    max_size: int | None = None,
+    chunk_size: int = 64 * 1024
+) -> Iterator[str]:
+    body = _get_body(event=event, default=default, max_size=max_size)
+    if body is None:
+        return
+    # NOTE: As for lines, a decoded base64 body is decoded one chunk at a time (the incremental decoder taking care of
+    #       the characters split between chunks).
+    if isinstance(body, bytes):
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        view = memoryview(body)
+        for start in range(0, len(body), chunk_size):
+            yield decoder.decode(view[start:start + chunk_size])
+        yield decoder.decode(b"", final=True)
+    else:
+        for start in range(0, len(body), chunk_size):
+            yield body[start:start + chunk_size]
+
+
+def get_request_line_uri(line: str) -> str | None:
+    if not line.strip():
+        return None
+    try:
+        item = json.loads(line)
+    except JSONDecodeError as error:
+        raise ValueError(f"Failed to parse '{line}' line from request!") from error
+    return item.get("uri") if isinstance(item, dict) else item
+
+
+def _get_body(event: dict | None, default: str, max_size: int | None) -> str | bytes | None:
+    body = event.get("body", default) if event is not None else default
+    if body is None:
+        return None
+    base64_encoded = event is not None and event.get("isBase64Encoded", False)
+    # NOTE: The size is checked before decoding, so that a huge body is rejected without being copied or parsed.
+    #       A base64 body is decoded to bytes, which json.loads accepts as they are (i.e. without decoding them first).
+    if max_size is not None and isinstance(body, str):
+        size = len(body) * 3 // 4 if base64_encoded else _get_utf8_size(text=body, max_size=max_size)
+        if size > max_size:
+            raise BodyTooLargeError(f"Request body too large, the maximum is {max_size} bytes!")
+    if not base64_encoded:
+        return body
+    try:
+        return b64decode(body, validate=True)
+    except (Base64Error, ValueError) as error:
+        raise ValueError("Failed to decode base64 body from request!") from error
+
+
+def _get_utf8_size(text: str, max_size: int) -> int:
+    # NOTE: A character is 1 to 4 bytes in UTF-8, so the text only needs to be encoded to know its size when it is not
+    #       ASCII (which CPython knows without scanning it) and within the bounds of the maximum.
+    if text.isascii() or len(text) > max_size or len(text) * 4 <= max_size:
+        return len(text)
+    return len(text.encode("utf-8", "surrogatepass"))
+
+
+def _get_line_bounds(body: str | bytes, newline: str | bytes) -> Iterator[tuple[int, int]]:
+    start = 0
+    while start < len(body):
+        end = body.find(newline, start)
+        if end == -1:
+            end = len(body)
+        yield start, end
+        start = end + 1
@@ -1,28 +1,329 @@
+import base64
+import csv
+import gzip
 import json
+import os
+import re
+from collections.abc import Callable, Iterable
+from functools import lru_cache
+from hashlib import blake2b
+from importlib import import_module
+from importlib.util import find_spec
+from io import StringIO
+from types import ModuleType
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def build_response(status: int = 200, body: dict | None = None) -> dict:
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+PRETTY_RESPONSES = os.environ.get("PRETTY_RESPONSES", "true") == "true"
+
+MESSAGE_PLACEHOLDER = "__MESSAGE__"
+ERRORS = {
+    400: "Bad Request",
+    404: "Not Found",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+# NOTE: Below that size, the compressed body (once base64-encoded) would hardly be any smaller.
+MIN_COMPRESSED_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+ETAG_SIZE = 16
+JSON_MEDIA_TYPE = "application/json"
+SURROGATE_REGEX = re.compile("[\ud800-\udfff]")
+
+
+def build_response(
+    status: int = 200,
+    body: dict | None = None,
+    pretty: bool | None = None,
+    media_type: str = JSON_MEDIA_TYPE
+) -> dict:
     if body is None:
         body = {}
+    if media_type != JSON_MEDIA_TYPE:
+        # NOTE: The other formats are encoded as bytes, which API Gateway requires to be base64-encoded.
+        return {
+            "statusCode": status,
+            "headers": {"Content-Type": media_type},
+            "body": base64.b64encode(ENCODERS[media_type](body)).decode("ascii"),
+            "isBase64Encoded": True,
+        }
     return {
         "statusCode": status,
-        "body": json.dumps(body, indent=4),
+        "body": _dumps(body, pretty=PRETTY_RESPONSES if pretty is None else pretty),
     }
 
 
-def build_error_response(status: int = 500, message: str = "") -> dict:
-    error = "Unknown"
-    match status:
-        case 400:
-            error = "Bad Request"
-        case 404:
-            error = "Not Found"
-        case 500:
-            error = "Internal Server Error"
-    return build_response(
-        status=status,
-        body={
-            "error": error,
-            "message": message
-        }
-    )
+def build_ndjson_response(status: int = 200, lines: Iterable[dict] = ()) -> dict:
+    body = StringIO()
+    for line in lines:
+        body.write(_dumps(line, pretty=False))
+        body.write("\n")
+    return {
+        "statusCode": status,
+        "headers": {"Content-Type": "application/x-ndjson"},
+        "body": body.getvalue(),
+    }
+
+
+def build_not_modified_response(headers: dict[str, str]) -> dict:
+    return {
+        "statusCode": 304,
+        "headers": headers,
+        "body": "",
+    }
+
+
+def build_etag(*parts: str | bytes) -> str:
+    digest = blake2b(digest_size=ETAG_SIZE)
+    for part in parts:
+        digest.update(part.encode("utf-8", "surrogatepass") if isinstance(part, str) else part)
+        digest.update(b"\0")
+    return f'"{digest.hexdigest()}"'
+
+
+def matches_etag(if_none_match: str | None, etag: str) -> bool:
+    # NOTE: As per RFC 9110 (section 13.1.2), the comparison is weak. The encoding suffix (see compress_response) is
+    #       ignored too, since the content is the same whatever its encoding.
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for tag in if_none_match.split(","):
+        tag = tag.strip().removeprefix("W/")
+        for encoding in ENCODINGS:
+            suffix = f'-{encoding}"'
+            if tag.endswith(suffix):
+                tag = tag[:-len(suffix)] + '"'
+                break
+        if tag == etag:
+            return True
+    return False
+
+
+def compress_response(response: dict, accept_encoding: str | None) -> dict:
+    body = response.get("body")
+    if not body or response.get("isBase64Encoded") or len(body) < MIN_COMPRESSED_SIZE:
+        return response
+    headers = response.get("headers") or {}
+    vary = headers.get("Vary")
+    headers = {**headers, "Vary": f"{vary}, Accept-Encoding" if vary else "Accept-Encoding"}
+    encoding = _negotiate_encoding(accept_encoding)
+    if encoding is None:
+        return {**response, "headers": headers}
+    # NOTE: A lone surrogate (which cannot be encoded as UTF-8) is written as its JSON escape instead.
+    data = body.encode("utf-8", "backslashreplace")
+    if encoding == "br":
+        data = brotli.compress(data, quality=BROTLI_QUALITY)
+    else:
+        data = gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    headers["Content-Encoding"] = encoding
+    # NOTE: A strong ETag identifies the bytes of the response, so each encoding has its own (as in Apache httpd).
+    if "ETag" in headers:
+        headers["ETag"] = f'{headers["ETag"][:-1]}-{encoding}"'
+    return {
+        **response,
+        "headers": headers,
+        "body": base64.b64encode(data).decode("ascii"),
+        "isBase64Encoded": True,
+    }
+
+
+def build_error_body(status: int = 500, message: str = "") -> dict:
+    return {
+        "error": ERRORS.get(status, "Unknown"),
+        "message": message
+    }
+
+
+def build_error_response(status: int = 500, message: str = "", pretty: bool | None = None) -> dict:
+    pretty = PRETTY_RESPONSES if pretty is None else pretty
+    prefix, suffix = _get_error_template(status=status, pretty=pretty)
+    return {
+        "statusCode": status,
+        "body": prefix + _dumps(message, pretty=pretty) + suffix,
+    }
+
+
+@lru_cache(maxsize=64)
+def negotiate_media_type(accept: str | None) -> str:
+    # NOTE: The supported media type with the highest weight wins (JSON on ties, and when none is acceptable), where
+    #       "type/*" and "*/*" are the weights of the others. An encoder is supported only if its package is installed,
+    #       which is looked up without importing it, so that negotiating JSON costs no import at all.
+    if not accept:
+        return JSON_MEDIA_TYPE
+    weights = {}
+    for item in accept.split(","):
+        name, _, params = item.partition(";")
+        weight = 1.0
+        for param in params.replace(" ", "").split(";"):
+            if param.startswith("q="):
+                try:
+                    weight = float(param[2:])
+                except ValueError:
+                    weight = 0.0
+        weights[name.strip().lower()] = weight
+    best_media_type, best_weight = JSON_MEDIA_TYPE, 0.0
+    for media_type in (JSON_MEDIA_TYPE, *ENCODERS):
+        weight = weights.get(media_type, weights.get(f"{media_type.partition('/')[0]}/*", weights.get("*/*", 0.0)))
+        if weight > best_weight and _is_available(media_type):
+            best_media_type, best_weight = media_type, weight
+    return best_media_type
+
+
+def register_encoder(media_type: str, encoder: Callable[[dict], bytes], package: str | None = None) -> None:
+    # NOTE: An encoder turns a response body into bytes. Its package (if any) is only imported by the encoder itself.
+    if media_type == JSON_MEDIA_TYPE or media_type in ENCODERS:
+        raise ValueError(f"Encoder already registered: {media_type}")
+    ENCODERS[media_type] = encoder
+    if package is not None:
+        ENCODER_PACKAGES[media_type] = package
+    negotiate_media_type.cache_clear()
+
+
+@lru_cache(maxsize=64)
+def _get_error_template(status: int, pretty: bool) -> tuple[str, str]:
+    # NOTE: The error body has a fixed shape, so it is serialized once per status and then only the message is added.
+    body = _dumps(build_error_body(status=status, message=MESSAGE_PLACEHOLDER), pretty=pretty)
+    prefix, _, suffix = body.partition(_dumps(MESSAGE_PLACEHOLDER, pretty=pretty))
+    return prefix, suffix
+
+
+@lru_cache(maxsize=64)
+def _negotiate_encoding(accept_encoding: str | None) -> str | None:
+    # NOTE: The supported encoding with the highest weight wins (brotli on ties), "*" being the weight of the others.
+    if not accept_encoding:
+        return None
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        weight = 1.0
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+    best_encoding, best_weight = None, 0.0
+    for encoding in ENCODINGS:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best_encoding, best_weight = encoding, weight
+    return best_encoding
+
+
+def _dumps(value, pretty: bool) -> str:
+    if pretty:
+        return json.dumps(value, indent=4)
+    # NOTE: The lone surrogates (e.g. from a "\ud800" escape in the request) cannot be encoded as UTF-8, so orjson
+    #       rejects them, and they are escaped instead (as in the pretty-printed responses) by both encoders alike.
+    if orjson is not None:
+        try:
+            return orjson.dumps(value).decode()
+        except orjson.JSONEncodeError:
+            return json.dumps(value, separators=(",", ":"))
+    text = json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+    if not text.isascii() and SURROGATE_REGEX.search(text):
+        return json.dumps(value, separators=(",", ":"))
+    return text
+
+
+def _is_available(media_type: str) -> bool:
+    package = ENCODER_PACKAGES.get(media_type)
+    return package is None or find_spec(package) is not None
+
+
+@lru_cache(maxsize=None)
+def _import_package(name: str) -> ModuleType:
+    return import_module(name)
+
+
+def _encode_msgpack(value: dict) -> bytes:
+    packb = _import_package("msgpack").packb
+    try:
+        return packb(value, use_bin_type=True)
+    except UnicodeEncodeError:
+        return packb(_escape_surrogates(value), use_bin_type=True)
+
+
+def _encode_cbor(value: dict) -> bytes:
+    dumps = _import_package("cbor2").dumps
+    try:
+        return dumps(value)
+    except UnicodeEncodeError:
+        return dumps(_escape_surrogates(value))
+
+
+def _escape_surrogates(value):
+    # NOTE: The lone surrogates (which UTF-8 cannot encode) are written as their escapes (e.g. "\\ud800"), as in JSON.
+    if isinstance(value, str):
+        return value.encode("utf-8", "backslashreplace").decode("utf-8")
+    if isinstance(value, dict):
+        return {_escape_surrogates(name): _escape_surrogates(item) for name, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_escape_surrogates(item) for item in value]
+    return value
+
+
+def _encode_csv(value: dict) -> bytes:
+    rows = _get_csv_rows(value)
+    output = StringIO()
+    writer = csv.DictWriter(output, fieldnames=list(dict.fromkeys(name for row in rows for name in row)))
+    writer.writeheader()
+    writer.writerows(rows)
+    return output.getvalue().encode("utf-8", "backslashreplace")
+
+
+def _get_csv_rows(value: dict) -> list[dict]:
+    # NOTE: A batch (i.e. a body made of a single array of objects, such as "results" or "groups") is a row per object,
+    #       whose "result" and "error" objects are flattened into it. Any other body (or its single object, such as
+    #       "aggregate") is a single row. The other nested values (e.g. "query_params") are written as JSON.
+    items = next(iter(value.values())) if len(value) == 1 else value
+    if isinstance(items, list) and all(isinstance(item, dict) for item in items):
+        return [_get_csv_row(item) for item in items]
+    row = items if isinstance(items, dict) else value
+    return [{name: _get_csv_value(field) for name, field in row.items()}]
+
+
+def _get_csv_row(item: dict) -> dict:
+    row = {}
+    for name, field in item.items():
+        if isinstance(field, dict):
+            row.update((nested_name, _get_csv_value(nested)) for nested_name, nested in field.items())
+        else:
+            row[name] = _get_csv_value(field)
+    return row
+
+
+def _get_csv_value(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (dict, list)):
+        return _dumps(value, pretty=False)
+    return value
+
+
+# NOTE: The encoders of the formats other than JSON, each one importing its package (if any) only on first use.
+ENCODERS: dict[str, Callable[[dict], bytes]] = {
+    "application/msgpack": _encode_msgpack,
+    "application/x-msgpack": _encode_msgpack,
+    "application/cbor": _encode_cbor,
+    "text/csv": _encode_csv,
+}
+ENCODER_PACKAGES: dict[str, str] = {
+    "application/msgpack": "msgpack",
+    "application/x-msgpack": "msgpack",
+    "application/cbor": "cbor2",
+}
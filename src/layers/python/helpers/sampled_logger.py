@@ -0,0 +1,50 @@
+import logging
+from collections.abc import Callable
+from time import monotonic
+
+
+class SampledLogger:
+    # NOTE: A token bucket in front of a logger: up to "burst" records are logged at once, and then up to "rate" records
+    #       per second, while the others are dropped before being even formatted. The number of records dropped is
+    #       added to the next one logged, so that a burst of junk input shows up in the logs without flooding them.
+    def __init__(
+        self,
+        logger: logging.Logger,
+        rate: float = 10.0,
+        burst: int = 10,
+        clock: Callable[[], float] = monotonic
+    ):
+        if rate < 0:
+            raise ValueError(f"Invalid log rate: {rate}")
+        if burst <= 0:
+            raise ValueError(f"Invalid log burst: {burst}")
+        self.logger = logger
+        self.rate = rate
+        self.burst = burst
+        self.suppressed = 0
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+
+    def log(self, level: int, message: str, *args) -> bool:
+        if not self.logger.isEnabledFor(level):
+            return False
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens < 1:
+            self.suppressed += 1
+            return False
+        self._tokens -= 1
+        if self.suppressed:
+            suppressed, self.suppressed = self.suppressed, 0
+            self.logger.log(level, message + " (%d similar records suppressed)", *args, suppressed)
+        else:
+            self.logger.log(level, message, *args)
+        return True
+
+    def error(self, message: str, *args) -> bool:
+        return self.log(logging.ERROR, message, *args)
+
+    def warning(self, message: str, *args) -> bool:
+        return self.log(logging.WARNING, message, *args)
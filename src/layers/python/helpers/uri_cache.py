@@ -0,0 +1,201 @@
+import json
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from hashlib import blake2b
+from logging import getLogger
+from time import monotonic
+from typing import Any
+
+
+MISSING = object()
+KEY_PREFIX = "uri-parser:v1:"
+KEY_SIZE = 16
+
+
+class LruCache:
+    def __init__(self, max_size: int = 1024, ttl: float | None = None, clock: Callable[[], float] = monotonic):
+        if max_size <= 0:
+            raise ValueError(f"Invalid cache size: {max_size}")
+        self.max_size = max_size
+        self.ttl = ttl if ttl else None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[Any, float | None]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= self._clock():
+            del self._entries[key]
+            self.evictions += 1
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        expires_at = self._clock() + self.ttl if self.ttl is not None else None
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_many(self, keys: Iterable[Hashable]) -> dict[Hashable, Any]:
+        values = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not MISSING:
+                values[key] = value
+        return values
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+        }
+
+
+class KeyValueCache:  # pylint: disable=too-many-instance-attributes
+    # NOTE: A shared key-value store (i.e. any client with the get, mget and set methods of redis-py), behind a local
+    #       LRU cache, so that fresh containers start warm while hot entries still cost no round trip. The values are
+    #       stored as JSON, so that those which are not serializable (e.g. a ParsedUri) are only cached locally.
+    # pylint: disable-next=too-many-arguments,too-many-positional-arguments
+    def __init__(
+        self,
+        client: Any,
+        local: LruCache | None = None,
+        ttl: float | None = None,
+        retry_after: float = 30,
+        clock: Callable[[], float] = monotonic
+    ):
+        self.client = client
+        self.local = local if local is not None else LruCache()
+        self.ttl = int(ttl) if ttl else None
+        self.retry_after = retry_after
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._clock = clock
+        self._retry_at = 0.0
+        self._logger = getLogger("uri_cache")
+
+    def __len__(self) -> int:
+        return len(self.local)
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        value = self.local.get(key)
+        if value is not MISSING:
+            return value
+        data = self._call("get", _encode_key(key))
+        if data is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        value = self._decode(key=key, data=data)
+        return value if value is not MISSING else default
+
+    def get_many(self, keys: Iterable[Hashable]) -> dict[Hashable, Any]:
+        # NOTE: The entries missing locally are fetched at once (i.e. in a single round trip), and kept locally.
+        keys = list(dict.fromkeys(keys))
+        values = self.local.get_many(keys)
+        missing_keys = [key for key in keys if key not in values]
+        if not missing_keys:
+            return values
+        data_items = self._call("mget", [_encode_key(key) for key in missing_keys]) or [None] * len(missing_keys)
+        for key, data in zip(missing_keys, data_items):
+            if data is None:
+                self.misses += 1
+                continue
+            self.hits += 1
+            value = self._decode(key=key, data=data)
+            if value is not MISSING:
+                values[key] = value
+        return values
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self.local.set(key, value)
+        # NOTE: The values which are not serializable (e.g. a ParsedUri) or not encodable (e.g. with a lone surrogate)
+        #       are only cached locally, without calling the store (which would count as a failure of the store).
+        try:
+            data = json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        except (TypeError, UnicodeEncodeError):
+            return
+        self._call("set", _encode_key(key), data, ex=self.ttl)
+
+    def clear(self) -> None:
+        # NOTE: Only the local entries are cleared, since the shared ones may be used by other containers.
+        self.local.clear()
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "available": self._retry_at <= self._clock(),
+            "local": self.local.stats(),
+        }
+
+    def _decode(self, key: Hashable, data: str | bytes) -> Any:
+        try:
+            value = _to_tuples(json.loads(data))
+        except ValueError:
+            self.errors += 1
+            return MISSING
+        self.local.set(key, value)
+        return value
+
+    def _call(self, method: str, *args, **kwargs) -> Any:
+        # NOTE: When the store fails (e.g. is down or times out), it is not called again for a while, so that each
+        #       lookup falls back to computing the value straight away, instead of waiting for the store again.
+        if self._retry_at > self._clock():
+            return None
+        try:
+            return getattr(self.client, method)(*args, **kwargs)
+        # pylint: disable-next=broad-exception-caught
+        except Exception as error:
+            self.errors += 1
+            self._retry_at = self._clock() + self.retry_after
+            self._logger.warning("Cache store unavailable for %s s: %s", self.retry_after, str(error))
+            return None
+
+
+def create_redis_client(url: str, timeout: float = 0.1) -> Any:
+    # NOTE: redis is not a dependency (i.e. not in the Lambda layer), so it is only imported if a shared cache is used.
+    #       The client (and its connection pool) is meant to be created once per container, and reused across
+    #       invocations.
+    try:
+        import redis  # pylint: disable=import-outside-toplevel
+    except ImportError as error:
+        raise ImportError("The 'redis' package is required for a shared cache!") from error
+    return redis.Redis.from_url(url, socket_timeout=timeout, socket_connect_timeout=timeout)
+
+
+def _encode_key(key: Hashable) -> str:
+    # NOTE: The keys are hashed, so that they have a bounded size whatever the URI.
+    # NOTE: A lone surrogate (which UTF-8 cannot encode) is encoded as is, so that its URI still has a key.
+    data = json.dumps(key, ensure_ascii=False).encode("utf-8", "surrogatepass")
+    digest = blake2b(data, digest_size=KEY_SIZE).hexdigest()
+    return f"{KEY_PREFIX}{digest}"
+
+
+def _to_tuples(value: Any) -> Any:
+    # NOTE: JSON has no tuples, while the cached values are immutable (e.g. the items of a parsed URI), hence tuples.
+    if isinstance(value, list):
+        return tuple(_to_tuples(item) for item in value)
+    return value
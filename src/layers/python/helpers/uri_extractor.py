@@ -0,0 +1,70 @@
+import re
+from collections.abc import Iterable, Iterator
+
+
+# NOTE: A single scanner for all the kinds of URIs, tried in the same order as the validators (i.e. URLs first, so that
+#       the emails and IPs within them are not found on their own). None of them can span whitespace, which is what
+#       makes the scan of a stream of chunks possible (see extract_uri_spans).
+EXTRACT_REGEX = re.compile(
+    r"(?P<url>(?<![\w+.\-])[A-Za-z][A-Za-z0-9+.\-]*://[^\s<>\"'`{}|\\^]+)"
+    r"|(?P<email>(?<![\w.%+\-])[A-Za-z0-9._%+\-]+@[A-Za-z0-9\-]+(?:\.[A-Za-z0-9\-]+)+)"
+    r"|(?P<ipv6>(?<![\w:.])(?:[0-9A-Fa-f]{0,4}:){2,7}[0-9A-Fa-f]{0,4}(?:%[\w.\-]+)?(?![\w:]))"
+    r"|(?P<ipv4>(?<![\w.])(?:[0-9]{1,3}\.){3}[0-9]{1,3}(?:/[0-9]{1,2})?(?![\w.]))"
+)
+IPV6_GROUPS = 8
+# NOTE: Only ASCII whitespace is looked for, which is enough to bound the carry (and is safe, since a URI cannot span
+#       any other whitespace either).
+WHITESPACE_CHARS = " \t\n\r\f\v"
+TRAILING_CHARS = ".,;:!?'\"*"
+CLOSING_BRACKETS = {")": "(", "]": "[", ">": "<"}
+# NOTE: A chunk whose last token (i.e. after its last whitespace) is longer than that is not carried over any further.
+MAX_CARRY_SIZE = 64 * 1024
+
+
+def extract_uri_spans(chunks: Iterable[str]) -> Iterator[tuple[int, int, str]]:
+    # NOTE: Everything up to the last whitespace of the text received so far is scanned, while the rest (i.e. what may
+    #       be the beginning of a URI) is carried over to the next chunk. This way, the matches are yielded as soon as
+    #       they are found and only the last token is kept in memory, whatever the size of the text.
+    carry = ""
+    offset = 0
+    for chunk in chunks:
+        text = carry + chunk
+        end = _get_last_whitespace_end(text)
+        if end == 0 and len(text) > MAX_CARRY_SIZE:
+            end = len(text)
+        yield from _scan(text=text, end=end, offset=offset)
+        carry = text[end:]
+        offset += end
+    if carry:
+        yield from _scan(text=carry, end=len(carry), offset=offset)
+
+
+def _get_last_whitespace_end(text: str) -> int:
+    return max(text.rfind(char) for char in WHITESPACE_CHARS) + 1
+
+
+def _scan(text: str, end: int, offset: int) -> Iterator[tuple[int, int, str]]:
+    for match in EXTRACT_REGEX.finditer(text, 0, end):
+        uri = match.group()
+        # NOTE: An IPv6 address either has all its groups or a "::", which rules out the times (e.g. "13:55:36") that
+        #       fill logs, without even validating them.
+        if match.lastgroup == "ipv6" and "::" not in uri and uri.count(":") != IPV6_GROUPS - 1:
+            continue
+        uri = _trim(uri)
+        if uri:
+            start = offset + match.start()
+            yield start, start + len(uri), uri
+
+
+def _trim(uri: str) -> str:
+    # NOTE: As in prose (e.g. "see http://domain.tld/path)."), the trailing punctuation and unbalanced closing brackets
+    #       are most likely not part of the URI.
+    while uri:
+        last = uri[-1]
+        if last in TRAILING_CHARS:
+            uri = uri[:-1]
+        elif last in CLOSING_BRACKETS and uri.count(last) > uri.count(CLOSING_BRACKETS[last]):
+            uri = uri[:-1]
+        else:
+            break
+    return uri
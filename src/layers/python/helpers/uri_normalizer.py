@@ -0,0 +1,118 @@
+import re
+from hashlib import blake2b
+from ipaddress import ip_address
+from urllib.parse import quote
+
+
+DEFAULT_PORTS = {
+    "ftp": 21,
+    "http": 80,
+    "https": 443,
+    "ws": 80,
+    "wss": 443,
+}
+UNRESERVED_CHARS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~")
+# NOTE: Besides the reserved characters, "%" is safe too, so that the existing percent-encodings are not encoded twice.
+SAFE_CHARS = "%:/?#[]@!$&'()*+,;="
+KEY_SIZE = 16
+
+PERCENT_ENCODING_REGEX = re.compile(r"%([0-9A-Fa-f]{2})")
+
+
+def normalize_uri(uri: str) -> str:
+    uri = uri.strip()
+    scheme, separator, rest = uri.partition("://")
+    if not separator:
+        return _normalize_opaque(uri)
+
+    rest, _, fragment = rest.partition("#")
+    rest, _, query = rest.partition("?")
+    slash = rest.find("/")
+    netloc, path = (rest, "") if slash < 0 else (rest[:slash], rest[slash:])
+    scheme = scheme.lower()
+
+    canonical = f"{scheme}://{_normalize_netloc(netloc=netloc, scheme=scheme)}{_normalize_path(path)}"
+    query = _normalize_query(query)
+    if query:
+        canonical += f"?{query}"
+    if fragment:
+        canonical += f"#{_normalize_percent_encoding(fragment)}"
+    return canonical
+
+
+def get_uri_key(canonical: str) -> str:
+    return blake2b(canonical.encode("utf-8"), digest_size=KEY_SIZE).hexdigest()
+
+
+def _normalize_opaque(uri: str) -> str:
+    # NOTE: IP addresses are normalized to their shortest form, emails by lowercasing their (case-insensitive) domain.
+    try:
+        return str(ip_address(uri))
+    except ValueError:
+        pass
+    if uri.count("@") == 1:
+        local, _, domain = uri.partition("@")
+        return f"{local}@{domain.lower()}"
+    return uri
+
+
+def _normalize_netloc(netloc: str, scheme: str) -> str:
+    userinfo, separator, hostport = netloc.rpartition("@")
+    if hostport.startswith("["):
+        host, _, port = hostport.partition("]")
+        host = _normalize_ipv6_host(host[1:])
+        port = port.removeprefix(":")
+    else:
+        host, _, port = hostport.partition(":")
+        host = _normalize_host(host)
+    if port.isascii() and port.isdigit():
+        port = "" if int(port) == DEFAULT_PORTS.get(scheme) else str(int(port))
+    userinfo = f"{_normalize_percent_encoding(userinfo)}@" if separator else ""
+    return f"{userinfo}{host}:{port}" if port else f"{userinfo}{host}"
+
+
+def _normalize_host(host: str) -> str:
+    host = host.rstrip(".").lower()
+    try:
+        return host.encode("idna").decode("ascii")
+    except UnicodeError:
+        return host
+
+
+def _normalize_ipv6_host(host: str) -> str:
+    try:
+        return f"[{ip_address(host).compressed}]"
+    except ValueError:
+        return f"[{host.lower()}]"
+
+
+def _normalize_path(path: str) -> str:
+    # NOTE: Same as RFC 3986 "remove_dot_segments" (section 5.2.4), since the path of a URI with an authority is either
+    #       empty or absolute, in which case it is normalized to "/" (see section 6.2.3).
+    segments = path.split("/")
+    output = [""]
+    for segment in segments[1:]:
+        if segment == "..":
+            if len(output) > 1:
+                output.pop()
+        elif segment != ".":
+            output.append(segment)
+    if segments[-1] in (".", ".."):
+        output.append("")
+    return _normalize_percent_encoding("/".join(output)) if len(output) > 1 else "/"
+
+
+def _normalize_query(query: str) -> str:
+    # NOTE: The parameters are sorted by name only (with a stable sort), since the order of repeated ones may matter.
+    params = [_normalize_percent_encoding(param) for param in query.split("&") if param]
+    params.sort(key=lambda param: param.partition("=")[0])
+    return "&".join(params)
+
+
+def _normalize_percent_encoding(component: str) -> str:
+    return PERCENT_ENCODING_REGEX.sub(_normalize_percent_encoded_char, quote(component, safe=SAFE_CHARS))
+
+
+def _normalize_percent_encoded_char(match: re.Match) -> str:
+    char = chr(int(match.group(1), 16))
+    return char if char in UNRESERVED_CHARS else f"%{match.group(1).upper()}"
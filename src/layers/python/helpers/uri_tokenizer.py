@@ -0,0 +1,188 @@
+import re
+from ipaddress import IPv6Address
+
+
+# NOTE: Same as the RFC 3986 regex (see appendix B), except that the scheme must be valid (see section 3.1). Since all
+#       its groups are optional, it matches any string, in a single pass.
+URI_REGEX = re.compile(r"(?:([A-Za-z][A-Za-z0-9+.\-]*):)?(?://([^/?#]*))?([^?#]*)(?:\?([^#]*))?(?:#(.*))?", re.DOTALL)
+IP_FUTURE_REGEX = re.compile(r"[vV][0-9A-Fa-f]+\.[A-Za-z0-9\-._~!$&'()*+,;=:]+")
+MAX_PORT = 65535
+
+SCHEME_GROUP = 1
+AUTHORITY_GROUP = 2
+PATH_GROUP = 3
+QUERY_GROUP = 4
+FRAGMENT_GROUP = 5
+
+SCHEME_END = 0
+AUTHORITY_START = 1
+USERINFO_END = 2
+HOST_START = 3
+HOST_END = 4
+PORT = 5
+PATH_START = 6
+QUERY_START = 7
+FRAGMENT_START = 8
+
+
+class UriSyntaxError(ValueError):
+    def __init__(self, message: str, position: int):
+        super().__init__(f"{message} at position {position}")
+        self.position = position
+
+
+class UriComponents:
+    # NOTE: Only the bounds of the components are kept (i.e. a tuple indexed by SCHEME_END, AUTHORITY_START, etc., with
+    #       -1 for a missing component), while their substrings are built only when requested.
+    __slots__ = ("uri", "bounds")
+
+    def __init__(self, uri: str, bounds: tuple[int | None, ...]):
+        self.uri = uri
+        self.bounds = bounds
+
+    @property
+    def scheme(self) -> str | None:
+        end = self.bounds[SCHEME_END]
+        return self.uri[:end].lower() if end >= 0 else None
+
+    @property
+    def authority(self) -> str | None:
+        start = self.bounds[AUTHORITY_START]
+        return self.uri[start:self.bounds[PATH_START]] if start >= 0 else None
+
+    @property
+    def userinfo(self) -> str | None:
+        end = self.bounds[USERINFO_END]
+        return self.uri[self.bounds[AUTHORITY_START]:end] if end >= 0 else None
+
+    @property
+    def host(self) -> str | None:
+        start = self.bounds[HOST_START]
+        return self.uri[start:self.bounds[HOST_END]] if start >= 0 else None
+
+    @property
+    def hostname(self) -> str | None:
+        # NOTE: As in urlparse, the host is lowercased, except for the zone ID of an IPv6 literal, if any.
+        host = self.host
+        if not host:
+            return None
+        host, percent, zone = host.partition("%")
+        return host.lower() + percent + zone
+
+    @property
+    def port(self) -> int | None:
+        return self.bounds[PORT]
+
+    @property
+    def path(self) -> str:
+        return self.uri[self.bounds[PATH_START]:self._get_path_end()]
+
+    @property
+    def query(self) -> str | None:
+        start = self.bounds[QUERY_START]
+        return self.uri[start:self._get_query_end()] if start >= 0 else None
+
+    @property
+    def fragment(self) -> str | None:
+        start = self.bounds[FRAGMENT_START]
+        return self.uri[start:] if start >= 0 else None
+
+    def offsets(self) -> dict[str, tuple[int, int]]:
+        scheme_end, authority_start, userinfo_end, host_start, host_end, _, path_start, query_start, fragment_start = (
+            self.bounds
+        )
+        offsets = {}
+        if scheme_end >= 0:
+            offsets["scheme"] = (0, scheme_end)
+        if authority_start >= 0:
+            offsets["authority"] = (authority_start, path_start)
+        offsets["path"] = (path_start, self._get_path_end())
+        if query_start >= 0:
+            offsets["query"] = (query_start, self._get_query_end())
+        if fragment_start >= 0:
+            offsets["fragment"] = (fragment_start, len(self.uri))
+        if userinfo_end >= 0:
+            offsets["userinfo"] = (authority_start, userinfo_end)
+        if host_start >= 0:
+            offsets["host"] = (host_start, host_end)
+        return offsets
+
+    def _get_path_end(self) -> int:
+        # NOTE: The delimiters ("?" and "#") are right before the query and the fragment.
+        for start in (self.bounds[QUERY_START], self.bounds[FRAGMENT_START]):
+            if start >= 0:
+                return start - 1
+        return len(self.uri)
+
+    def _get_query_end(self) -> int:
+        start = self.bounds[FRAGMENT_START]
+        return start - 1 if start >= 0 else len(self.uri)
+
+
+def tokenize(uri: str) -> UriComponents:
+    match = URI_REGEX.match(uri)
+    start, end = match.span(AUTHORITY_GROUP)
+    userinfo_end, host_start, host_end, port = _tokenize_authority(uri=uri, start=start, end=end)
+    return UriComponents(
+        uri=uri,
+        bounds=(
+            match.end(SCHEME_GROUP),
+            start,
+            userinfo_end,
+            host_start,
+            host_end,
+            port,
+            match.start(PATH_GROUP),
+            match.start(QUERY_GROUP),
+            match.start(FRAGMENT_GROUP),
+        )
+    )
+
+
+def _tokenize_authority(uri: str, start: int, end: int) -> tuple[int, int, int, int | None]:
+    if start < 0:
+        return -1, -1, -1, None
+    userinfo_end = uri.rfind("@", start, end)
+    host_start = userinfo_end + 1 if userinfo_end >= 0 else start
+    if host_start < end and uri[host_start] == "[":
+        host_end = uri.find("]", host_start, end)
+        if host_end < 0:
+            raise UriSyntaxError("Unterminated IP literal", host_start)
+        _check_ip_literal(uri=uri, start=host_start + 1, end=host_end)
+        port_start = host_end + 1
+        if port_start < end and uri[port_start] != ":":
+            raise UriSyntaxError(f"Unexpected {uri[port_start]!r} after IP literal", port_start)
+        host_start += 1
+    else:
+        port_start = uri.find(":", host_start, end)
+        host_end = port_start if port_start >= 0 else end
+        for bracket in "[]":
+            bracket_position = uri.find(bracket, host_start, host_end)
+            if bracket_position >= 0:
+                raise UriSyntaxError(f"Unexpected {bracket!r} in host", bracket_position)
+    port = _get_port(uri=uri, start=port_start + 1, end=end) if 0 <= port_start < end else None
+    return userinfo_end, host_start, host_end, port
+
+
+def _check_ip_literal(uri: str, start: int, end: int) -> None:
+    literal = uri[start:end]
+    if IP_FUTURE_REGEX.fullmatch(literal):
+        return
+    # NOTE: The zone ID (see RFC 6874) is not validated, only the address is.
+    address = literal.partition("%")[0]
+    try:
+        IPv6Address(address)
+    except ValueError as error:
+        raise UriSyntaxError(f"Invalid IPv6 address {address!r}", start) from error
+
+
+def _get_port(uri: str, start: int, end: int) -> int | None:
+    port = uri[start:end]
+    if not port:
+        return None
+    if not port.isascii() or not port.isdigit():
+        raise UriSyntaxError(f"Invalid port {port!r}", start)
+    value = int(port)
+    if value > MAX_PORT:
+        raise UriSyntaxError(f"Port {value} out of range 0-{MAX_PORT}", start)
+    return value
@@ -1,33 +1,461 @@
+import json
 import logging
-from helpers.request_parsers import get_query_string, get_request_body
-from helpers.response_factory import build_response, build_error_response
-from helpers.uri_parser import UriParser
+import os
+from collections.abc import Callable, Iterable, Iterator
+from time import perf_counter
+from helpers.metrics import Metrics
+from helpers.request_parsers import (
+    BodyTooLargeError,
+    get_header,
+    get_query_string,
+    get_request_body,
+    get_request_chunks,
+    get_request_line_uri,
+    get_request_lines,
+    get_request_text
+)
+from helpers.response_factory import (
+    build_error_body,
+    build_error_response,
+    build_etag,
+    build_ndjson_response,
+    build_not_modified_response,
+    build_response,
+    compress_response,
+    matches_etag,
+    negotiate_media_type
+)
+from helpers.host_lists import load_host_lists
+from helpers.sampled_logger import SampledLogger
+from helpers.uri_cache import create_redis_client, KeyValueCache, LruCache
+from helpers.uri_parser import ENGINES, INVALID_URI_MESSAGE, UriParser
 
 
+MAX_BATCH_SIZE = 10000
+MAX_BODY_SIZE = 64 * 1024
+MAX_BATCH_BODY_SIZE = 6 * 1024 * 1024
+MAX_TOP = 100
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/jsonl")
+TEXT_CONTENT_TYPES = ("text/plain",)
+
+init_start = perf_counter()
+
 logger = logging.getLogger("uri-parser-rest-api.parse")
 logger.setLevel(logging.INFO)
+# NOTE: The client errors (e.g. invalid URIs) are expected, and may come in bursts, so only a sample of them is logged.
+error_logger = SampledLogger(
+    logger=logger,
+    rate=float(os.environ.get("URI_PARSER_ERROR_LOG_RATE", "10")),
+    burst=int(os.environ.get("URI_PARSER_ERROR_LOG_BURST", "10"))
+)
+
+# NOTE: Built once per container (i.e. at cold start) and reused across invocations.
+metrics = Metrics(enabled=os.environ.get("METRICS_ENABLED", "false") == "true")
+cache_size = int(os.environ.get("URI_PARSER_CACHE_SIZE", "0"))
+cache_ttl = float(os.environ.get("URI_PARSER_CACHE_TTL", "0"))
+cache_url = os.environ.get("URI_PARSER_CACHE_URL")
+cache = LruCache(max_size=cache_size, ttl=cache_ttl) if cache_size > 0 else None
+if cache_url:
+    # NOTE: The local cache is kept in front of the shared one (with a default size when URI_PARSER_CACHE_SIZE is 0,
+    #       since the entries that are not serializable are only cached locally), which falls back to parsing when
+    #       unavailable.
+    cache = KeyValueCache(
+        client=create_redis_client(
+            url=cache_url,
+            timeout=float(os.environ.get("URI_PARSER_CACHE_TIMEOUT", "0.1"))
+        ),
+        local=cache,
+        ttl=cache_ttl
+    )
+lists_file = os.environ.get("URI_PARSER_LISTS_FILE")
+uri_parser = UriParser(
+    logger=logger,
+    cache=cache,
+    metrics=metrics,
+    host_lists=load_host_lists(path=lists_file) if lists_file else None,
+    engine=os.environ.get("URI_PARSER_ENGINE", "urlparse"),
+    compared_engine=os.environ.get("URI_PARSER_COMPARED_ENGINE") or None,
+    compared_rate=float(os.environ.get("URI_PARSER_COMPARED_RATE", "0.01")),
+    compared_logger=error_logger
+)
+# NOTE: The parsers of the engines requested per request, built on first use and sharing the cache (keyed by engine).
+engine_parsers = {uri_parser.engine: uri_parser}
+if uri_parser.host_lists is not None:
+    logger.info("Host lists loaded: %s", uri_parser.host_lists.stats())
+# NOTE: The results only depend on the request and on the parser (i.e. its version, engine and lists), hence the ETags.
+ETAG_SEED = ":".join((
+    os.environ.get("URI_PARSER_VERSION", ""),
+    uri_parser.engine,
+    str(uri_parser.host_lists.stats()) if uri_parser.host_lists is not None else ""
+))
+cache_max_age = int(os.environ.get("URI_PARSER_CACHE_MAX_AGE", "0"))
+# NOTE: The responses echo the URIs (including their userinfo, e.g. passwords) of authorized requests, so they must not
+#       be stored by shared caches.
+CACHE_CONTROL = f"private, max-age={cache_max_age}" if cache_max_age > 0 else "no-cache"
+if os.environ.get("URI_PARSER_WARM_UP", "false") == "true":
+    uri_parser.warm_up()
+
+logger.info("Handler init duration: %.3f ms", (perf_counter() - init_start) * 1000)
 
 
 def handler(event, context):
-    logger.debug("Event: %s", event)
-    logger.debug("Context: %s", context)
+    _log_request(event=event, context=context)
+    with metrics.timer("HandlerTime"):
+        response = _handle_conditional(event=event, name="parse", handle=_handle)
+    metrics.flush(dimensions={"Handler": "parse"})
+    return response
+
+
+def batch_handler(event, context):
+    _log_request(event=event, context=context)
+    with metrics.timer("HandlerTime"):
+        response = _handle_conditional(event=event, name="parse_batch", handle=_handle_batch)
+    metrics.flush(dimensions={"Handler": "parse_batch"})
+    return response
+
+
+def extract_handler(event, context):
+    _log_request(event=event, context=context)
+    with metrics.timer("HandlerTime"):
+        response = _handle_conditional(event=event, name="extract", handle=_handle_extract)
+    metrics.flush(dimensions={"Handler": "extract"})
+    return response
+
+
+def _handle_conditional(event: dict | None, name: str, handle: Callable[[dict | None], dict]) -> dict:
+    # NOTE: A request whose ETag matches is answered straight away, without even decoding its body.
+    try:
+        headers = {"ETag": _get_etag(event=event, name=name), "Cache-Control": CACHE_CONTROL, "Vary": "Accept"}
+        if matches_etag(if_none_match=get_header(event=event, name="If-None-Match"), etag=headers["ETag"]):
+            metrics.increment("NotModified")
+            return build_not_modified_response(headers=headers)
+        response = handle(event)
+        if response["statusCode"] == 200:
+            response["headers"] = {**(response.get("headers") or {}), **headers}
+        with metrics.timer("CompressTime"):
+            return compress_response(
+                response=response,
+                accept_encoding=get_header(event=event, name="Accept-Encoding")
+            )
+    # pylint: disable-next=broad-exception-caught
+    except Exception as error:
+        logger.error("Error: %s", str(error))
+        return build_error_response(status=500, message=str(error))
+
+
+def _get_etag(event: dict | None, name: str) -> str:
+    event = event or {}
+    # NOTE: A body which is not a string (e.g. an object, which is rejected when decoded) is hashed as an empty one.
+    body = event.get("body")
+    return build_etag(
+        ETAG_SEED,
+        name,
+        _get_content_type(event=event),
+        _get_media_type(event=event),
+        json.dumps(sorted((event.get("queryStringParameters") or {}).items())),
+        str(bool(event.get("isBase64Encoded"))),
+        body if isinstance(body, (str, bytes)) else ""
+    )
+
 
+def _handle(event: dict | None) -> dict:
+    pretty = _is_pretty(event=event)
     try:
-        force = get_query_string(event=event, name="force", default="false") == "true"
-        body = get_request_body(event=event)
-        uri = body.get("uri")
+        force = _is_enabled(event=event, name="force")
+        normalize = _is_enabled(event=event, name="normalize")
+        include = _get_include(event=event)
+        parser = _get_uri_parser(event=event)
+        with metrics.timer("DecodeTime"):
+            # NOTE: A plain text body is the URI itself, so there is no JSON to decode at all.
+            if _get_content_type(event=event) in TEXT_CONTENT_TYPES:
+                uri = get_request_text(event=event, max_size=MAX_BODY_SIZE).strip()
+            else:
+                uri = get_request_body(event=event, max_size=MAX_BODY_SIZE).get("uri")
         if not uri:
             raise ValueError("Missing 'uri' parameter in request!")
+        if not isinstance(uri, str):
+            raise ValueError(f"{INVALID_URI_MESSAGE}{uri}")
+
+        info = parser.try_parse_valid(uri=uri, force=force, include=include)
+        if info is None:
+            error_logger.error("Error: %s%s", INVALID_URI_MESSAGE, uri)
+            return build_error_response(status=400, message=INVALID_URI_MESSAGE + uri, pretty=pretty)
+        if normalize:
+            info.update(parser.normalize(uri))
+        _log_stats(parser=parser)
+        with metrics.timer("SerializeTime"):
+            return build_response(status=200, body=info, pretty=pretty, media_type=_get_media_type(event=event))
+    except BodyTooLargeError as error:
+        error_logger.error("Error: %s", error)
+        return build_error_response(status=413, message=str(error), pretty=pretty)
+    except ValueError as error:
+        error_logger.error("Error: %s", error)
+        return build_error_response(status=400, message=str(error), pretty=pretty)
+    except Exception as error:
+        logger.error("Error: %s", str(error))
+        return build_error_response(status=500, message=str(error), pretty=pretty)
 
-        uri_parser = UriParser(logger=logger)
-        if not force and not uri_parser.is_valid(uri):
-            raise ValueError(f"Not a valid URI: {uri}")
 
-        info = uri_parser.parse(uri)
-        return build_response(status=200, body=info)
+def _handle_batch(event: dict | None) -> dict:
+    pretty = _is_pretty(event=event)
+    try:
+        force = _is_enabled(event=event, name="force")
+        normalize = _is_enabled(event=event, name="normalize")
+        dedup = _is_enabled(event=event, name="dedup")
+        top = _get_aggregate_top(event=event, dedup=dedup)
+        include = _get_include(event=event)
+        parser = _get_uri_parser(event=event)
+        content_type = _get_content_type(event=event)
+        if content_type in NDJSON_CONTENT_TYPES + TEXT_CONTENT_TYPES:
+            if dedup:
+                raise ValueError("The 'dedup' option is not supported with newline-delimited URIs!")
+            plain = content_type in TEXT_CONTENT_TYPES
+            lines = get_request_lines(event=event, max_size=MAX_BATCH_BODY_SIZE)
+            if top is not None:
+                body = {
+                    "aggregate": parser.aggregate_queries(
+                        uris=_get_batch_line_uris(lines=lines, plain=plain),
+                        force=force,
+                        top=top
+                    )
+                }
+                with metrics.timer("SerializeTime"):
+                    return build_response(
+                        status=200,
+                        body=body,
+                        pretty=pretty,
+                        media_type=_get_media_type(event=event)
+                    )
+            return build_ndjson_response(
+                status=200,
+                lines=(
+                    _parse_batch_line(
+                        parser=parser,
+                        line=line,
+                        force=force,
+                        include=include,
+                        normalize=normalize,
+                        plain=plain
+                    )
+                    for line in lines
+                )
+            )
+
+        with metrics.timer("DecodeTime"):
+            body = get_request_body(event=event, max_size=MAX_BATCH_BODY_SIZE)
+        uris = body.get("uris")
+        if not uris:
+            raise ValueError("Missing 'uris' parameter in request!")
+        if not isinstance(uris, list):
+            raise ValueError("The 'uris' parameter must be an array!")
+        if len(uris) > MAX_BATCH_SIZE:
+            raise ValueError(f"Too many URIs in request, the maximum is {MAX_BATCH_SIZE}!")
+
+        if dedup:
+            body = {"groups": _parse_batch_groups(parser=parser, uris=uris, force=force, include=include)}
+        elif top is not None:
+            parser.prefetch(uris=_get_valid_strings(uris), force=force)
+            body = {"aggregate": parser.aggregate_queries(uris=uris, force=force, top=top)}
+        else:
+            parser.prefetch(uris=_get_valid_strings(uris), force=force, normalize=normalize)
+            body = {
+                "results": [
+                    _parse_batch_item(parser=parser, uri=uri, force=force, include=include, normalize=normalize)
+                    for uri in uris
+                ]
+            }
+        _log_stats(parser=parser)
+        with metrics.timer("SerializeTime"):
+            return build_response(status=200, body=body, pretty=pretty, media_type=_get_media_type(event=event))
+    except BodyTooLargeError as error:
+        error_logger.error("Error: %s", error)
+        return build_error_response(status=413, message=str(error), pretty=pretty)
     except ValueError as error:
+        error_logger.error("Error: %s", error)
+        return build_error_response(status=400, message=str(error), pretty=pretty)
+    except Exception as error:
         logger.error("Error: %s", str(error))
-        return build_error_response(status=400, message=str(error))
+        return build_error_response(status=500, message=str(error), pretty=pretty)
+
+
+def _handle_extract(event: dict | None) -> dict:
+    pretty = _is_pretty(event=event)
+    try:
+        force = _is_enabled(event=event, name="force")
+        include = _get_include(event=event)
+        parser = _get_uri_parser(event=event)
+        # NOTE: A plain text body is the text itself, which is then scanned one chunk at a time, and each URI found is
+        #       written as soon as parsed, so that neither the chunks nor the results are all held at once.
+        if _get_content_type(event=event) in TEXT_CONTENT_TYPES:
+            text = get_request_chunks(event=event, max_size=MAX_BATCH_BODY_SIZE)
+        else:
+            with metrics.timer("DecodeTime"):
+                text = get_request_body(event=event, max_size=MAX_BATCH_BODY_SIZE).get("text")
+            if not isinstance(text, str):
+                raise ValueError("Missing 'text' parameter in request!")
+        return build_ndjson_response(status=200, lines=parser.extract(text=text, force=force, include=include))
+    except BodyTooLargeError as error:
+        error_logger.error("Error: %s", error)
+        return build_error_response(status=413, message=str(error), pretty=pretty)
+    except ValueError as error:
+        error_logger.error("Error: %s", error)
+        return build_error_response(status=400, message=str(error), pretty=pretty)
     except Exception as error:
         logger.error("Error: %s", str(error))
-        return build_error_response(status=500, message=str(error))
+        return build_error_response(status=500, message=str(error), pretty=pretty)
+
+
+def _log_request(event: dict | None, context) -> None:
+    # NOTE: Avoid even building the log records (which may hold huge events) unless debug logging is enabled.
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Event: %s", event)
+        logger.debug("Context: %s", context)
+
+
+def _get_content_type(event: dict | None) -> str:
+    content_type = get_header(event=event, name="Content-Type", default="application/json")
+    return content_type.split(";", 1)[0].strip().lower()
+
+
+def _get_media_type(event: dict | None) -> str:
+    return negotiate_media_type(get_header(event=event, name="Accept"))
+
+
+def _get_include(event: dict | None) -> tuple[str, ...]:
+    include = get_query_string(event=event, name="include")
+    if not include:
+        return ()
+    names = tuple(name.strip() for name in include.split(",") if name.strip())
+    for name in names:
+        if name not in uri_parser.extra_fields:
+            raise ValueError(f"Unknown 'include' value: {name}")
+    return names
+
+
+def _get_uri_parser(event: dict | None) -> UriParser:
+    engine = get_query_string(event=event, name="engine")
+    if engine is None:
+        return uri_parser
+    parser = engine_parsers.get(engine)
+    if parser is None:
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown 'engine' value: {engine}")
+        parser = engine_parsers[engine] = UriParser(
+            logger=logger,
+            cache=cache,
+            metrics=metrics,
+            host_lists=uri_parser.host_lists,
+            engine=engine
+        )
+    return parser
+
+
+def _log_stats(parser: UriParser) -> None:
+    logger.debug("Cache stats: %s", parser.cache_stats())
+    if parser.differential is not None:
+        logger.debug("Engine comparison stats: %s", parser.differential.stats())
+
+
+def _get_aggregate_top(event: dict | None, dedup: bool) -> int | None:
+    # NOTE: The number of top values per query parameter key, only if the query parameters are to be aggregated.
+    if not _is_enabled(event=event, name="aggregate"):
+        return None
+    if dedup:
+        raise ValueError("The 'dedup' and 'aggregate' options cannot be combined!")
+    top = get_query_string(event=event, name="top", default="10")
+    if not top.isdecimal() or not 1 <= int(top) <= MAX_TOP:
+        raise ValueError(f"Invalid 'top' value: {top}")
+    return int(top)
+
+
+def _is_enabled(event: dict | None, name: str) -> bool:
+    return get_query_string(event=event, name=name, default="false") == "true"
+
+
+def _is_pretty(event: dict | None) -> bool | None:
+    pretty = get_query_string(event=event, name="pretty")
+    return pretty == "true" if pretty is not None else None
+
+
+def _parse_batch_groups(parser: UriParser, uris: list, force: bool, include: tuple[str, ...]) -> list[dict]:
+    # NOTE: Equivalent URIs are grouped by their canonical form, so that each group is parsed once. The first URI of a
+    #       group is the one validated and parsed (rather than the canonical form, whose percent-encoding and brackets
+    #       could turn an invalid URI into a valid one), while a URI that cannot be normalized is a group of its own.
+    groups = []
+    groups_by_key = {}
+    for index, uri in enumerate(uris):
+        if not uri or not isinstance(uri, str):
+            item = _parse_batch_item(parser=parser, uri=uri, force=force, include=include)
+            groups.append({"uris": [uri], "indexes": [index], **item})
+            continue
+        try:
+            normalized = parser.normalize(uri)
+        except ValueError as error:
+            item = {"status": 400, "error": build_error_body(status=400, message=str(error))}
+            groups.append({"uris": [uri], "indexes": [index], **item})
+            continue
+        group = groups_by_key.get(normalized["key"])
+        if group is None:
+            group = groups_by_key[normalized["key"]] = {**normalized, "uris": [], "indexes": []}
+            groups.append(group)
+        group["uris"].append(uri)
+        group["indexes"].append(index)
+    metrics.increment("DuplicateUris", len(uris) - len(groups))
+    parser.prefetch(uris=[group["uris"][0] for group in groups_by_key.values()], force=force)
+    for group in groups_by_key.values():
+        group.update(_parse_batch_item(parser=parser, uri=group["uris"][0], force=force, include=include))
+    return groups
+
+
+def _get_valid_strings(uris: list) -> list[str]:
+    return [uri for uri in uris if uri and isinstance(uri, str)]
+
+
+# pylint: disable-next=too-many-arguments,too-many-positional-arguments
+def _parse_batch_item(
+    parser: UriParser,
+    uri: str | None,
+    force: bool,
+    include: tuple[str, ...],
+    normalize: bool = False
+) -> dict:
+    try:
+        if not uri:
+            raise ValueError("Missing 'uri' value in batch!")
+        if not isinstance(uri, str):
+            raise ValueError(f"{INVALID_URI_MESSAGE}{uri}")
+        info = parser.try_parse_valid(uri=uri, force=force, include=include)
+        if info is None:
+            return {"status": 400, "error": build_error_body(status=400, message=INVALID_URI_MESSAGE + uri)}
+        if normalize:
+            info.update(parser.normalize(uri))
+        return {"status": 200, "result": info}
+    except ValueError as error:
+        return {"status": 400, "error": build_error_body(status=400, message=str(error))}
+    except Exception as error:
+        logger.error("Error: %s", str(error))
+        return {"status": 500, "error": build_error_body(status=500, message=str(error))}
+
+
+# pylint: disable-next=too-many-arguments,too-many-positional-arguments
+def _parse_batch_line(
+    parser: UriParser,
+    line: str,
+    force: bool,
+    include: tuple[str, ...],
+    normalize: bool,
+    plain: bool
+) -> dict:
+    try:
+        uri = line if plain else get_request_line_uri(line=line)
+    except ValueError as error:
+        return {"status": 400, "error": build_error_body(status=400, message=str(error))}
+    return _parse_batch_item(parser=parser, uri=uri, force=force, include=include, normalize=normalize)
+
+
+def _get_batch_line_uris(lines: Iterable[str], plain: bool) -> Iterator[str | None]:
+    for line in lines:
+        try:
+            yield line if plain else get_request_line_uri(line=line)
+        except ValueError:
+            yield None
@@ -0,0 +1,218 @@
+import argparse
+import asyncio
+import base64
+import logging
+import multiprocessing
+import os
+import signal
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from http import HTTPStatus
+from urllib.parse import parse_qsl
+from helpers.response_factory import build_error_response, build_response
+from src.parse import batch_handler, extract_handler, handler
+
+
+MAX_HEAD_SIZE = 64 * 1024
+MAX_BODY_SIZE = 6 * 1024 * 1024
+MAX_PIPELINED_REQUESTS = 16
+STATUS_MESSAGE = "REST API up and running... long live and prosper!"
+
+logger = logging.getLogger("uri-parser-rest-api.server")
+logger.setLevel(logging.INFO)
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+# pylint: disable-next=unused-argument
+def status_handler(event, context):
+    return build_response(status=200, body={"message": STATUS_MESSAGE})
+
+
+ROUTES = {
+    ("POST", "/api/parse"): handler,
+    ("POST", "/api/parse/batch"): batch_handler,
+    ("POST", "/api/extract"): extract_handler,
+    ("GET", "/api/status"): status_handler,
+}
+
+
+async def serve(host: str, port: int, executor: Executor) -> asyncio.Server:
+    return await asyncio.start_server(
+        partial(_handle_connection, executor=executor),
+        host=host,
+        port=port,
+        limit=MAX_HEAD_SIZE
+    )
+
+
+def create_executor(workers: int) -> Executor:
+    # NOTE: Validation and parsing are CPU-bound, so (unless explicitly disabled) they are run in separate processes.
+    # Workers are spawned (not forked), so they never inherit the listening socket and keep it bound after a crash.
+    if workers > 0:
+        return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    return ThreadPoolExecutor(max_workers=1)
+
+
+async def _handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, executor: Executor) -> None:
+    # NOTE: Pipelined requests are dispatched as soon as they are read, while their responses are written in order.
+    responses: asyncio.Queue = asyncio.Queue(maxsize=MAX_PIPELINED_REQUESTS)
+    writer_task = asyncio.create_task(_write_responses(responses=responses, writer=writer))
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            try:
+                request = await _read_request(reader=reader)
+            except HttpError as error:
+                await responses.put((_completed(build_error_response(status=error.status, message=str(error))), False))
+                break
+            if request is None:
+                break
+            event, keep_alive = request
+            function = ROUTES.get((event["httpMethod"], event["path"]))
+            if function is None:
+                message = f"No route for {event['httpMethod']} {event['path']}"
+                future = _completed(build_error_response(status=404, message=message))
+            else:
+                future = loop.run_in_executor(executor, function, event, None)
+            await responses.put((future, keep_alive))
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        await responses.put(None)
+        await writer_task
+        writer.close()
+
+
+async def _read_request(reader: asyncio.StreamReader) -> tuple[dict, bool] | None:
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as error:
+        if error.partial.strip():
+            raise HttpError(400, "Incomplete request!") from error
+        return None
+    except asyncio.LimitOverrunError as error:
+        raise HttpError(431, "Request header fields too large!") from error
+
+    method, target, version, headers = _parse_head(head=head)
+    lowercase_headers = {name.lower(): value for name, value in headers.items()}
+    if "chunked" in lowercase_headers.get("transfer-encoding", "").lower():
+        raise HttpError(501, "Chunked transfer encoding is not supported!")
+    try:
+        length = int(lowercase_headers.get("content-length", "0"))
+    except ValueError as error:
+        raise HttpError(400, "Invalid Content-Length header!") from error
+    if length < 0:
+        raise HttpError(400, "Invalid Content-Length header!")
+    if length > MAX_BODY_SIZE:
+        raise HttpError(413, f"Request body too large, the maximum is {MAX_BODY_SIZE} bytes!")
+    try:
+        body = await reader.readexactly(length) if length > 0 else None
+    except asyncio.IncompleteReadError as error:
+        raise HttpError(400, "Incomplete request!") from error
+
+    connection = lowercase_headers.get("connection", "").lower()
+    keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+    path, _, query = target.partition("?")
+    event = {
+        "httpMethod": method,
+        "path": path,
+        "headers": headers,
+        "queryStringParameters": dict(parse_qsl(query, keep_blank_values=True)) or None,
+        "body": body.decode("utf-8", errors="replace") if body is not None else None,
+        "isBase64Encoded": False,
+    }
+    return event, keep_alive
+
+
+def _parse_head(head: bytes) -> tuple[str, str, str, dict[str, str]]:
+    request_line, *header_lines = head.decode("latin-1").rstrip("\r\n").split("\r\n")
+    try:
+        method, target, version = request_line.split(" ")
+    except ValueError as error:
+        raise HttpError(400, f"Malformed request line: {request_line}") from error
+    headers = {}
+    for line in header_lines:
+        name, _, value = line.partition(":")
+        headers[name.strip()] = value.strip()
+    return method, target, version, headers
+
+
+async def _write_responses(responses: asyncio.Queue, writer: asyncio.StreamWriter) -> None:
+    connected = True
+    while (item := await responses.get()) is not None:
+        future, keep_alive = item
+        try:
+            response = await future
+        except Exception as error:
+            logger.error("Error: %s", str(error))
+            response = build_error_response(status=500, message=str(error))
+        if not connected:
+            continue
+        try:
+            writer.write(_render_response(response=response, keep_alive=keep_alive))
+            await writer.drain()
+        except ConnectionError:
+            connected = False
+
+
+def _render_response(response: dict, keep_alive: bool) -> bytes:
+    status = response["statusCode"]
+    body = response.get("body") or ""
+    body = base64.b64decode(body) if response.get("isBase64Encoded") else body.encode("utf-8")
+    try:
+        reason = HTTPStatus(status).phrase
+    except ValueError:
+        reason = "Unknown"
+    headers = {
+        "Content-Type": "application/json",
+        **(response.get("headers") or {}),
+        "Content-Length": str(len(body)),
+        "Connection": "keep-alive" if keep_alive else "close",
+    }
+    head = f"HTTP/1.1 {status} {reason}\r\n" + "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+    return head.encode("latin-1") + b"\r\n" + body
+
+
+def _completed(response: dict) -> asyncio.Future:
+    future = asyncio.get_running_loop().create_future()
+    future.set_result(response)
+    return future
+
+
+async def _main(host: str, port: int, workers: int) -> None:
+    with create_executor(workers=workers) as executor:
+        server = await serve(host=host, port=port, executor=executor)
+        logger.info("Listening on %s", ", ".join(str(socket.getsockname()) for socket in server.sockets))
+        loop = asyncio.get_running_loop()
+        stopped = asyncio.Event()
+        for signal_number in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signal_number, stopped.set)
+        async with server:
+            await stopped.wait()
+        logger.info("Shutting down")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve the URI Parser REST API over HTTP, outside AWS Lambda")
+    parser.add_argument("--host", default="0.0.0.0", help="The address to listen on")
+    parser.add_argument("--port", type=int, default=8080, help="The port to listen on")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="The number of worker processes (0 to parse in a thread of the server process)"
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig()
+    asyncio.run(_main(host=args.host, port=args.port, workers=args.workers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import io
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# Inject helpers packages (in production this is done via Lambda layer):
+sys.path.append("src/layers/python/")
+
+# pylint: disable-next=wrong-import-position
+from src.cli import main  # noqa: E402
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.input = os.path.join(self.directory.name, "input.txt")
+        self.output = os.path.join(self.directory.name, "output")
+        with open(self.input, "w", encoding="utf-8") as file:
+            file.write("http://domain.tld:8080\n\nnot-a-uri\n")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _read_output(self) -> str:
+        with open(self.output, encoding="utf-8", newline="") as file:
+            return file.read()
+
+    def test_main_when_jsonl(self):
+        result = main([self.input, "--output", self.output, "--workers", "1"])
+
+        self.assertEqual(0, result)
+        self.assertEqual(
+            '{"uri":"http://domain.tld:8080","status":200,"result":{"fragment":null,"host":"domain.tld","port":8080,'
+            '"path":null,"query":null,"raw":"http://domain.tld:8080","scheme":"http","userinfo":null,"kind":"url"}}\n'
+            '{"uri":"not-a-uri","status":400,"error":{"error":"Bad Request","message":"Not a valid URI: not-a-uri"}}\n',
+            self._read_output()
+        )
+
+    def test_main_when_csv(self):
+        result = main([self.input, "--output", self.output, "--format", "csv", "--workers", "2", "--chunk-size", "1"])
+
+        self.assertEqual(0, result)
+        self.assertEqual(
+            "uri,status,error,message,fragment,host,port,path,query,raw,scheme,userinfo,kind\r\n"
+            "http://domain.tld:8080,200,,,,domain.tld,8080,,,http://domain.tld:8080,http,,url\r\n"
+            "not-a-uri,400,Bad Request,Not a valid URI: not-a-uri,,,,,,,,,\r\n",
+            self._read_output()
+        )
+
+    def test_main_when_stdin_and_forced(self):
+        with patch("sys.stdin", io.StringIO("not-a-uri\n")), patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            result = main(["--force", "--workers", "1"])
+
+        self.assertEqual(0, result)
+        self.assertEqual(
+            '{"uri":"not-a-uri","status":200,"result":{"fragment":null,"host":null,"port":null,"path":"not-a-uri",'
+            '"query":null,"raw":"not-a-uri","scheme":null,"userinfo":null,"kind":null}}\n',
+            stdout.getvalue()
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
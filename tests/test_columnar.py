@@ -0,0 +1,49 @@
+import sys
+import unittest
+from importlib.util import find_spec
+from unittest.mock import patch
+from src.layers.python.helpers.columnar import to_arrow, to_numpy, write_ipc, write_parquet
+from src.layers.python.helpers.uri_parser import UriParser
+
+
+URIS = ["http://domain.tld:8080/path", "not-a-uri", "127.0.0.1"]
+
+
+class TestColumnar(unittest.TestCase):
+    def setUp(self):
+        self.columns = UriParser().parse_columns(URIS)
+
+    @unittest.skipUnless(find_spec("numpy"), "numpy is not installed")
+    def test_to_numpy(self):
+        arrays = to_numpy(self.columns)
+
+        self.assertEqual([True, False, True], arrays["valid"].tolist())
+        self.assertEqual(["domain.tld", None, None], arrays["host"].tolist())
+        self.assertEqual([8080, None, None], arrays["port"].tolist())
+
+    @unittest.skipUnless(find_spec("pyarrow"), "pyarrow is not installed")
+    def test_to_arrow(self):
+        table = to_arrow(self.columns)
+
+        self.assertEqual(URIS, table.column("raw").to_pylist())
+        self.assertEqual([8080, None, None], table.column("port").to_pylist())
+        self.assertEqual("int32", str(table.schema.field("port").type))
+
+    @patch.dict(sys.modules, {"numpy": None})
+    def test_to_numpy_when_not_installed(self):
+        with self.assertRaises(ImportError) as error:
+            to_numpy(self.columns)
+
+        self.assertEqual("The 'numpy' package is required for this output!", str(error.exception))
+
+    @patch.dict(sys.modules, {"pyarrow": None, "pyarrow.parquet": None, "pyarrow.feather": None})
+    def test_write_when_not_installed(self):
+        for write in (write_parquet, write_ipc):
+            with self.assertRaises(ImportError) as error:
+                write(self.columns, path="results")
+
+            self.assertEqual("The 'pyarrow' package is required for this output!", str(error.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+from ipaddress import ip_address
+from parameterized import parameterized
+
+from src.layers.python.helpers.host_lists import DomainTrie, HostLists, IpRanges, load_host_lists
+
+
+class TestDomainTrie(unittest.TestCase):
+    sut = DomainTrie()
+    sut.add("domain.tld", names=("blocked",))
+    sut.add("sub.domain.tld", names=("internal",))
+    sut.add("Other.TLD.", names=("blocked",))
+    sut.add("other.tld", names=("internal",))
+    sut.add("bücher.tld", names=("blocked",))
+
+    @parameterized.expand([
+        ["domain.tld", {"blocked"}],
+        ["any.domain.tld", {"blocked"}],
+        ["any.sub.domain.tld", {"blocked", "internal"}],
+        ["other.tld", {"blocked", "internal"}],
+        ["xn--bcher-kva.tld", {"blocked"}],
+        ["tld", set()],
+        ["domain.any", set()],
+        ["anydomain.tld", set()],
+    ])
+    def test_match(self, domain, expected_names):
+        self.assertEqual(expected_names, self.sut.match(domain))
+
+    def test_len(self):
+        self.assertEqual(5, len(self.sut))
+
+
+class TestIpRanges(unittest.TestCase):
+    sut = IpRanges(["10.0.0.0/8", "10.1.0.0/16", "11.0.0.0/8", "192.168.1.1", "fc00::/7"])
+
+    @parameterized.expand([
+        ["10.0.0.0", True],
+        ["11.255.255.255", True],
+        ["12.0.0.0", False],
+        ["9.255.255.255", False],
+        ["192.168.1.1", True],
+        ["192.168.1.2", False],
+        ["fd00::1", True],
+        ["::1", False],
+    ])
+    def test_contains(self, address, expected_result):
+        self.assertEqual(expected_result, ip_address(address) in self.sut)
+
+    def test_len(self):
+        self.assertEqual(3, len(self.sut))
+
+
+class TestHostLists(unittest.TestCase):
+    sut = HostLists({
+        "internal": {"domains": ["localhost"], "networks": ["127.0.0.0/8", "::1/128"]},
+        "blocked": {"domains": ["domain.tld"], "networks": ["127.0.0.1/32"]},
+        "tracking": {"query_keys": ["utm_source", "fbclid"]},
+    })
+
+    @parameterized.expand([
+        ["localhost", [], ["internal"]],
+        ["127.0.0.1", [], ["internal", "blocked"]],
+        ["::1", [], ["internal"]],
+        ["127.0.0.256", [], []],
+        ["Sub.Domain.TLD.", ["utm_source"], ["blocked", "tracking"]],
+        ["other.tld", ["key"], []],
+        [None, ["fbclid"], ["tracking"]],
+    ])
+    def test_match(self, host, query_keys, expected_names):
+        self.assertEqual(expected_names, self.sut.match(host=host, query_keys=query_keys))
+
+    def test_stats(self):
+        self.assertEqual({"lists": 3, "domains": 2, "networks": 3, "query_keys": 2}, self.sut.stats())
+
+    def test_load_host_lists(self):
+        sut = load_host_lists("src/layers/python/helpers/data/host_lists.json")
+
+        self.assertEqual(("internal", "blocked", "tracking"), sut.names)
+        self.assertEqual(["internal"], sut.match(host="192.168.0.1"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import io
+import json
+import unittest
+from unittest.mock import patch
+
+from src.layers.python.helpers.metrics import Metrics, NULL_TIMER
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.output = io.StringIO()
+        self.sut = Metrics(namespace="any-namespace", enabled=True, output=self.output)
+
+    def test_timer_when_disabled(self):
+        sut = Metrics(enabled=False, output=self.output)
+
+        with sut.timer("any-timer"):
+            pass
+        sut.flush()
+
+        self.assertIs(NULL_TIMER, sut.timer("any-timer"))
+        self.assertEqual("", self.output.getvalue())
+
+    def test_increment_when_disabled(self):
+        sut = Metrics(enabled=False, output=self.output)
+
+        sut.increment("any-counter")
+        sut.flush()
+
+        self.assertEqual("", self.output.getvalue())
+
+    def test_flush_when_empty(self):
+        self.sut.flush()
+
+        self.assertEqual("", self.output.getvalue())
+
+    @patch("src.layers.python.helpers.metrics.time", return_value=1700000000.123)
+    @patch("src.layers.python.helpers.metrics.perf_counter", side_effect=[1.0, 1.5, 2.0, 2.25])
+    def test_flush(self, _, __):
+        with self.sut.timer("AnyTime"):
+            pass
+        with self.sut.timer("AnyTime"):
+            pass
+        self.sut.increment("AnyCount")
+        self.sut.increment("AnyCount", 2)
+
+        self.sut.flush(dimensions={"AnyDimension": "any-value"})
+
+        self.assertEqual(
+            {
+                "_aws": {
+                    "Timestamp": 1700000000123,
+                    "CloudWatchMetrics": [
+                        {
+                            "Namespace": "any-namespace",
+                            "Dimensions": [["AnyDimension"]],
+                            "Metrics": [
+                                {"Name": "AnyTime", "Unit": "Milliseconds"},
+                                {"Name": "AnyCount", "Unit": "Count"}
+                            ]
+                        }
+                    ]
+                },
+                "AnyDimension": "any-value",
+                "AnyTime": 750.0,
+                "AnyCount": 3
+            },
+            json.loads(self.output.getvalue())
+        )
+
+    def test_flush_resets_values(self):
+        self.sut.increment("AnyCount")
+        self.sut.flush()
+        self.sut.flush()
+
+        self.assertEqual(1, len(self.output.getvalue().splitlines()))
+
+    def test_timer_when_fails(self):
+        with self.assertRaises(ValueError):
+            with self.sut.timer("AnyTime"):
+                raise ValueError("any-error")
+        self.sut.flush()
+
+        self.assertIn("AnyTime", json.loads(self.output.getvalue()))
+
+
+if __name__ == '__main__':
+    unittest.main()
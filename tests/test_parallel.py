@@ -0,0 +1,69 @@
+import unittest
+from parameterized import parameterized
+
+from src.layers.python.helpers.parallel import parse_item, parse_many
+from src.layers.python.helpers.uri_parser import UriParser
+
+
+class TestParallel(unittest.TestCase):
+    URIS = ["http://domain.tld", "not-a-uri", "127.0.0.1", "username@domain.tld", "::1"] * 3
+
+    @parameterized.expand([
+        [1, 1, True],
+        [1, 4, False],
+        [2, 1, True],
+        [2, 4, True],
+        [3, 2, False]
+    ])
+    def test_parse_many(self, workers, chunk_size, ordered):
+        rows = list(parse_many(uris=iter(self.URIS), workers=workers, chunk_size=chunk_size, ordered=ordered))
+
+        expected_rows = [parse_item(uri_parser=UriParser(), uri=uri) for uri in self.URIS]
+        if ordered:
+            self.assertEqual(expected_rows, rows)
+        else:
+            self.assertCountEqual(expected_rows, rows)
+
+    def test_parse_many_when_empty(self):
+        rows = list(parse_many(uris=[], workers=2))
+
+        self.assertEqual([], rows)
+
+    def test_parse_item(self):
+        row = parse_item(uri_parser=UriParser(), uri="http://domain.tld")
+
+        self.assertEqual(
+            {
+                "uri": "http://domain.tld",
+                "status": 200,
+                "result": {
+                    "fragment": None,
+                    "host": "domain.tld",
+                    "port": None,
+                    "path": None,
+                    "query": None,
+                    "raw": "http://domain.tld",
+                    "scheme": "http",
+                    "userinfo": None,
+                    "kind": "url"
+                }
+            },
+            row
+        )
+
+    @parameterized.expand([
+        ["not-a-uri", False, 400, "Bad Request", "Not a valid URI: not-a-uri"],
+        ["http://domain.tld:port", True, 400, "Bad Request", "Port could not be cast to integer value as 'port'"]
+    ])
+    # pylint: disable-next=too-many-arguments,too-many-positional-arguments
+    def test_parse_item_when_fails(self, uri, force, expected_status, expected_error, expected_message):
+        row = parse_item(uri_parser=UriParser(), uri=uri, force=force)
+
+        self.assertEqual(
+            {"uri": uri, "status": expected_status, "error": {"error": expected_error, "message": expected_message}},
+            row
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
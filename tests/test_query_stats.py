@@ -0,0 +1,114 @@
+import unittest
+from parameterized import parameterized
+
+from src.layers.python.helpers.query_stats import HyperLogLog, QueryStats, TopValues
+
+
+class TestHyperLogLog(unittest.TestCase):
+    @parameterized.expand([
+        [0],
+        [1],
+        [100],
+        [10000],
+        [200000],
+    ])
+    def test_count(self, size):
+        sut = HyperLogLog()
+        for index in range(size):
+            sut.add(f"value-{index}")
+            sut.add(f"value-{index}")
+
+        self.assertAlmostEqual(size, sut.count(), delta=size * 0.05)
+
+    def test_merge(self):
+        sut = HyperLogLog()
+        other = HyperLogLog()
+        for index in range(1000):
+            sut.add(f"value-{index}")
+            other.add(f"value-{index + 500}")
+
+        sut.merge(other)
+
+        self.assertAlmostEqual(1500, sut.count(), delta=1500 * 0.05)
+
+    def test_merge_when_precisions_differ(self):
+        with self.assertRaises(ValueError):
+            HyperLogLog(precision=10).merge(HyperLogLog(precision=12))
+
+    @parameterized.expand([
+        [3],
+        [17],
+    ])
+    def test_init_when_precision_is_invalid(self, precision):
+        with self.assertRaises(ValueError):
+            HyperLogLog(precision=precision)
+
+
+class TestTopValues(unittest.TestCase):
+    def test_top(self):
+        sut = TopValues(capacity=10)
+        for value in ["a", "b", "a", "c", "a", "b"]:
+            sut.add(value)
+
+        self.assertEqual([("a", 3, 0), ("b", 2, 0)], sut.top(2))
+
+    def test_top_keeps_frequent_values_among_distinct_ones(self):
+        sut = TopValues(capacity=10)
+        for index in range(10000):
+            sut.add(f"id-{index}")
+            if index % 4 == 0:
+                sut.add("frequent")
+
+        top = sut.top(1)
+
+        self.assertEqual("frequent", top[0][0])
+        self.assertLessEqual(top[0][1] - top[0][2], 2500)
+        self.assertGreaterEqual(top[0][1], 2500)
+        self.assertLessEqual(len(sut._counts), 20)  # pylint: disable=protected-access
+
+
+class TestQueryStats(unittest.TestCase):
+    def test_to_dict(self):
+        sut = QueryStats(top=2)
+        for query in ["utm_source=google&utm_medium=cpc", "utm_source=bing&utm_source=google", "q=a%20b&q=a+b&empty"]:
+            sut.add(query)
+
+        self.assertEqual(
+            {
+                "queries": 3,
+                "keys": {
+                    "utm_source": {
+                        "count": 3,
+                        "distinct": 2,
+                        "top": [{"value": "google", "count": 2, "error": 0}, {"value": "bing", "count": 1, "error": 0}]
+                    },
+                    "q": {"count": 2, "distinct": 1, "top": [{"value": "a b", "count": 2, "error": 0}]},
+                    "empty": {"count": 1, "distinct": 1, "top": [{"value": "", "count": 1, "error": 0}]},
+                    "utm_medium": {"count": 1, "distinct": 1, "top": [{"value": "cpc", "count": 1, "error": 0}]},
+                },
+                "other_keys": 0,
+            },
+            sut.to_dict()
+        )
+
+    def test_to_dict_when_too_many_keys(self):
+        sut = QueryStats(max_keys=2)
+        sut.add("a=1&b=2&c=3&d=4")
+        sut.add("c=3&a=1")
+
+        stats = sut.to_dict()
+
+        self.assertEqual(["a", "b"], list(stats["keys"]))
+        self.assertEqual(3, stats["other_keys"])
+
+    @parameterized.expand([
+        [{"top": 0}],
+        [{"max_keys": 0}],
+    ])
+    def test_init_when_invalid(self, kwargs):
+        with self.assertRaises(ValueError):
+            QueryStats(**kwargs)
+
+
+if __name__ == '__main__':
+    unittest.main()
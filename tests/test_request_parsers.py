@@ -1,10 +1,40 @@
+import base64
 import unittest
 from parameterized import parameterized
 
-from src.layers.python.helpers.request_parsers import get_path_parameter, get_query_string, get_request_body
+from src.layers.python.helpers.request_parsers import (
+    BodyTooLargeError,
+    get_header,
+    get_path_parameter,
+    get_query_string,
+    get_request_body,
+    get_request_chunks,
+    get_request_line_uri,
+    get_request_lines,
+    get_request_text
+)
 
 
 class TestRequestParsers(unittest.TestCase):
+    @parameterized.expand([
+        [None, "any-key", None],
+        [{}, "any-key", None],
+        [{"headers": None}, "any-key", None],
+        [{"headers": {}}, "any-key", None],
+        [{"headers": {"any-key": "any-value"}}, "any-key", "any-value"],
+        [{"headers": {"Any-Key": "any-value"}}, "any-key", "any-value"],
+        [{"headers": {"any-key": "any-value"}}, "ANY-KEY", "any-value"]
+    ])
+    def test_get_header(self, event, name, expected_header):
+        header = get_header(event=event, name=name)
+
+        self.assertEqual(expected_header, header)
+
+    def test_get_header_with_default(self):
+        header = get_header(event={}, name="any-key", default="any-default-value")
+
+        self.assertEqual("any-default-value", header)
+
     @parameterized.expand([
         [None, "any-key", None],
         [{}, "any-key", None],
@@ -118,13 +148,117 @@ class TestRequestParsers(unittest.TestCase):
 
         self.assertEqual({"any-default-key": "any-default-value"}, body)
 
-    def test_get_request_body_when_parse_fails(self):
-        invalid_event = {"body": "not-a-json"}
+    @parameterized.expand([
+        [{"body": "not-a-json"}, "Failed to parse body from request: Expecting value (at position 0)!"],
+        [{"body": '{"uri": "secret"'}, "Failed to parse body from request: Expecting ',' delimiter (at position 16)!"],
+        [{"body": "/w==", "isBase64Encoded": True}, "Failed to parse body from request: not a valid UTF-8 text!"],
+        [{"body": "not-base64!", "isBase64Encoded": True}, "Failed to decode base64 body from request!"]
+    ])
+    def test_get_request_body_when_parse_fails(self, event, expected_error_message):
+        with self.assertRaises(ValueError) as error:
+            get_request_body(event=event)
+
+        self.assertEqual(expected_error_message, str(error.exception))
+        self.assertNotIn(event["body"], str(error.exception))
+
+    def test_get_request_body_when_base64_encoded(self):
+        body = get_request_body(event={"body": "eyJ1cmkiOiAiaHR0cDovL2RvbWFpbi50bGQifQ==", "isBase64Encoded": True})
+
+        self.assertEqual({"uri": "http://domain.tld"}, body)
+
+    @parameterized.expand([
+        [{"body": '{"uri": "' + "a" * 100 + '"}'}],
+        [{"body": "YWFh" * 40, "isBase64Encoded": True}],
+        [{"body": '{"uri": "' + "\u20ac" * 30 + '"}'}]
+    ])
+    def test_get_request_body_when_too_large(self, event):
+        with self.assertRaises(BodyTooLargeError) as error:
+            get_request_body(event=event, max_size=100)
+
+        self.assertEqual("Request body too large, the maximum is 100 bytes!", str(error.exception))
+
+    def test_get_request_body_when_max_size_is_not_exceeded(self):
+        body = get_request_body(event={"body": '{"uri": "any-uri"}'}, max_size=18)
+
+        self.assertEqual({"uri": "any-uri"}, body)
+
+    def test_get_request_body_when_max_size_is_not_exceeded_in_utf8(self):
+        body = get_request_body(event={"body": '{"uri": "\u20ac\u00e4"}'}, max_size=16)
+
+        self.assertEqual({"uri": "\u20ac\u00e4"}, body)
+
+    @parameterized.expand([
+        [None, ""],
+        [{"body": None}, ""],
+        [{"body": "any-uri"}, "any-uri"],
+        [{"body": "w6Q=", "isBase64Encoded": True}, "\u00e4"]
+    ])
+    def test_get_request_text(self, event, expected_text):
+        text = get_request_text(event=event)
+
+        self.assertEqual(expected_text, text)
+
+    @parameterized.expand([
+        [None, []],
+        [{}, []],
+        [{"body": None}, []],
+        [{"body": ""}, []],
+        [{"body": "any-line"}, ["any-line"]],
+        [{"body": "any-line\n"}, ["any-line"]],
+        [{"body": "any-line-1\r\nany-line-2"}, ["any-line-1", "any-line-2"]],
+        [{"body": "any-line-1\n\nany-line-3\n"}, ["any-line-1", "", "any-line-3"]]
+    ])
+    def test_get_request_lines(self, event, expected_lines):
+        lines = get_request_lines(event=event)
+
+        self.assertEqual(expected_lines, list(lines))
+
+    def test_get_request_lines_when_base64_encoded(self):
+        lines = get_request_lines(event={"body": "YW55LWxpbmUtMQ0KYW55LWxpbmUtMg==", "isBase64Encoded": True})
+
+        self.assertEqual(["any-line-1", "any-line-2"], list(lines))
+
+    def test_get_request_lines_when_too_large(self):
+        with self.assertRaises(BodyTooLargeError):
+            list(get_request_lines(event={"body": "any-line\n" * 100}, max_size=100))
+
+    @parameterized.expand([
+        ['"any-uri"', "any-uri"],
+        ['{"uri": "any-uri"}', "any-uri"],
+        ['{"any-key": "any-value"}', None],
+        ["null", None],
+        ["", None],
+        ["  ", None],
+        ["1", 1]
+    ])
+    def test_get_request_line_uri(self, line, expected_uri):
+        uri = get_request_line_uri(line=line)
+
+        self.assertEqual(expected_uri, uri)
+
+    def test_get_request_line_uri_when_parse_fails(self):
+        with self.assertRaises(ValueError) as error:
+            get_request_line_uri(line="not-a-json")
+
+        self.assertEqual("Failed to parse 'not-a-json' line from request!", str(error.exception))
+
+
+class TestRequestChunks(unittest.TestCase):
+    def test_get_request_chunks(self):
+        chunks = get_request_chunks(event={"body": "any-text"}, chunk_size=3)
+
+        self.assertEqual(["any", "-te", "xt"], list(chunks))
+
+    def test_get_request_chunks_when_base64_encoded(self):
+        # NOTE: "é" is 2 bytes long in UTF-8, so it is split between the first 2 chunks.
+        event = {"body": base64.b64encode("aé-b".encode()).decode(), "isBase64Encoded": True}
+
+        chunks = get_request_chunks(event=event, chunk_size=2)
 
-        with self.assertRaises(Exception) as error:
-            get_request_body(event=invalid_event)
+        self.assertEqual("aé-b", "".join(chunks))
 
-        self.assertEqual(f"Failed to parse '{invalid_event}' body from request!", str(error.exception))
+    def test_get_request_chunks_when_missing(self):
+        self.assertEqual([], list(get_request_chunks(event={"body": None})))
 
 
 if __name__ == '__main__':
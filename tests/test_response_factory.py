@@ -1,7 +1,25 @@
+import base64
+import gzip
+import json
 import unittest
+from importlib import import_module
+from importlib.util import find_spec
+from unittest.mock import patch
 from parameterized import parameterized
 
-from src.layers.python.helpers.response_factory import build_response, build_error_response
+from src.layers.python.helpers.response_factory import (
+    build_response,
+    build_error_body,
+    build_error_response,
+    build_etag,
+    build_ndjson_response,
+    build_not_modified_response,
+    compress_response,
+    ENCODERS,
+    matches_etag,
+    negotiate_media_type,
+    register_encoder
+)
 
 
 class TestResponseFactory(unittest.TestCase):
@@ -46,6 +64,69 @@ class TestResponseFactory(unittest.TestCase):
 
         self.assertEqual(expected_response, response)
 
+    @parameterized.expand([
+        [None, '{}'],
+        [{"any-key": "any-value"}, '{"any-key":"any-value"}'],
+        [{"any-key": ["any-value", 1, None, True]}, '{"any-key":["any-value",1,null,true]}'],
+        [{"any-key": "ànÿ-välüe"}, '{"any-key":"ànÿ-välüe"}']
+    ])
+    def test_build_response_when_compact(self, body, expected_body):
+        response = build_response(status=200, body=body, pretty=False)
+
+        self.assertEqual({"statusCode": 200, "body": expected_body}, response)
+
+    @patch("src.layers.python.helpers.response_factory.orjson", None)
+    def test_build_response_when_compact_without_orjson(self):
+        response = build_response(status=200, body={"any-key": ["ànÿ-välüe", 1, None]}, pretty=False)
+
+        self.assertEqual({"statusCode": 200, "body": '{"any-key":["ànÿ-välüe",1,null]}'}, response)
+
+    @parameterized.expand([
+        [False],
+        [True],
+    ])
+    def test_build_response_with_lone_surrogate(self, pretty):
+        body = {"raw": json.loads('"http://domain.tld/\\ud800"')}
+
+        response = build_response(status=200, body=body, pretty=pretty)
+
+        self.assertEqual(body, json.loads(response["body"]))
+        self.assertTrue(response["body"].encode("utf-8"))
+
+    @patch("src.layers.python.helpers.response_factory.orjson", None)
+    def test_build_response_with_lone_surrogate_without_orjson(self):
+        body = {"raw": json.loads('"http://domain.tld/\\ud800"'), "any-key": "ànÿ-välüe"}
+
+        response = build_response(status=200, body=body, pretty=False)
+
+        self.assertEqual(body, json.loads(response["body"]))
+        self.assertTrue(response["body"].encode("utf-8"))
+
+    @parameterized.expand([
+        [[], ""],
+        [[{"any-key": "any-value"}], '{"any-key":"any-value"}\n'],
+        [({"any-key": i} for i in range(3)), '{"any-key":0}\n{"any-key":1}\n{"any-key":2}\n']
+    ])
+    def test_build_ndjson_response(self, lines, expected_body):
+        response = build_ndjson_response(status=200, lines=lines)
+
+        self.assertEqual(
+            {"statusCode": 200, "headers": {"Content-Type": "application/x-ndjson"}, "body": expected_body},
+            response
+        )
+
+    @parameterized.expand([
+        [400, "any-error-message", {"error": "Bad Request", "message": "any-error-message"}],
+        [404, "any-error-message", {"error": "Not Found", "message": "any-error-message"}],
+        [413, "any-error-message", {"error": "Payload Too Large", "message": "any-error-message"}],
+        [500, "any-error-message", {"error": "Internal Server Error", "message": "any-error-message"}],
+        [600, "any-error-message", {"error": "Unknown", "message": "any-error-message"}]
+    ])
+    def test_build_error_body(self, status, message, expected_body):
+        body = build_error_body(status=status, message=message)
+
+        self.assertEqual(expected_body, body)
+
     @parameterized.expand([
         [
             400,
@@ -85,6 +166,237 @@ class TestResponseFactory(unittest.TestCase):
 
         self.assertEqual(expected_response, response)
 
+    @parameterized.expand([
+        [400, "any-error-message", '{"error":"Bad Request","message":"any-error-message"}'],
+        [600, "any-error-message", '{"error":"Unknown","message":"any-error-message"}']
+    ])
+    def test_build_error_response_when_compact(self, status, message, expected_body):
+        response = build_error_response(status=status, message=message, pretty=False)
+
+        self.assertEqual({"statusCode": status, "body": expected_body}, response)
+
+    @parameterized.expand([
+        [True, 'any "quoted" message with \\ backslash'],
+        [True, "any message with ünicode and\nnewline"],
+        [True, "__MESSAGE__"],
+        [False, 'any "quoted" message with \\ backslash'],
+        [False, "any message with ünicode and\nnewline"],
+        [False, "__MESSAGE__"]
+    ])
+    def test_build_error_response_is_equivalent_to_build_response(self, pretty, message):
+        for status in [400, 404, 500, 600]:
+            response = build_error_response(status=status, message=message, pretty=pretty)
+
+            self.assertEqual(
+                build_response(status=status, body=build_error_body(status=status, message=message), pretty=pretty),
+                response
+            )
+            self.assertEqual(message, json.loads(response["body"])["message"])
+
+
+class TestConditionalResponses(unittest.TestCase):
+    ETAG = '"0123456789abcdef0123456789abcdef"'
+
+    def test_build_etag(self):
+        etag = build_etag("any-seed", "any-body")
+
+        self.assertRegex(etag, '^"[0-9a-f]{32}"$')
+        self.assertEqual(etag, build_etag("any-seed", b"any-body"))
+        # NOTE: The parts are delimited, so that they cannot be shifted into each other.
+        self.assertNotEqual(etag, build_etag("any-seed-any-body"))
+        self.assertNotEqual(etag, build_etag("any-seed", "any-bod", "y"))
+
+    @parameterized.expand([
+        [None, False],
+        ["", False],
+        ["*", True],
+        [ETAG, True],
+        [f"W/{ETAG}", True],
+        [f'"any-etag", {ETAG}', True],
+        ['"0123456789abcdef0123456789abcdef-gzip"', True],
+        ['"any-etag"', False],
+        ['"0123456789abcdef0123456789abcdef-any-encoding"', False],
+    ])
+    def test_matches_etag(self, if_none_match, expected_result):
+        self.assertEqual(expected_result, matches_etag(if_none_match=if_none_match, etag=self.ETAG))
+
+    def test_build_not_modified_response(self):
+        self.assertEqual(
+            {"statusCode": 304, "headers": {"ETag": self.ETAG}, "body": ""},
+            build_not_modified_response(headers={"ETag": self.ETAG})
+        )
+
+    def test_compress_response(self):
+        body = json.dumps({"any-key": "any-value" * 200})
+        response = {"statusCode": 200, "headers": {"ETag": self.ETAG}, "body": body}
+
+        compressed = compress_response(response=response, accept_encoding="deflate, gzip;q=0.8")
+
+        self.assertEqual(
+            {"ETag": '"0123456789abcdef0123456789abcdef-gzip"', "Vary": "Accept-Encoding", "Content-Encoding": "gzip"},
+            compressed["headers"]
+        )
+        self.assertTrue(compressed["isBase64Encoded"])
+        self.assertEqual(body, gzip.decompress(base64.b64decode(compressed["body"])).decode())
+        self.assertLess(len(compressed["body"]), len(body))
+
+    def test_compress_response_with_lone_surrogate(self):
+        response = {"statusCode": 200, "body": '{"raw": "\ud800' + "a" * 2048 + '"}'}
+
+        compressed = compress_response(response=response, accept_encoding="gzip")
+
+        body = gzip.decompress(base64.b64decode(compressed["body"])).decode()
+        self.assertEqual({"raw": "\ud800" + "a" * 2048}, json.loads(body))
+
+    @parameterized.expand([
+        [None],
+        ["identity"],
+        ["gzip;q=0"],
+        ["*;q=0"],
+        ["any-encoding"],
+    ])
+    def test_compress_response_when_not_accepted(self, accept_encoding):
+        response = {"statusCode": 200, "body": "a" * 2048}
+
+        self.assertEqual(
+            {"statusCode": 200, "headers": {"Vary": "Accept-Encoding"}, "body": "a" * 2048},
+            compress_response(response=response, accept_encoding=accept_encoding)
+        )
+
+    @parameterized.expand([
+        [{"statusCode": 200, "body": "{}"}],
+        [{"statusCode": 304, "body": ""}],
+        [{"statusCode": 200, "body": "YQ==" * 512, "isBase64Encoded": True}],
+    ])
+    def test_compress_response_when_not_compressible(self, response):
+        self.assertIs(response, compress_response(response=response, accept_encoding="gzip"))
+
+
+class TestEncoders(unittest.TestCase):
+    def setUp(self):
+        negotiate_media_type.cache_clear()
+        self.addCleanup(negotiate_media_type.cache_clear)
+
+    @parameterized.expand([
+        [None, "application/json"],
+        ["", "application/json"],
+        ["*/*", "application/json"],
+        ["application/json", "application/json"],
+        ["text/csv", "text/csv"],
+        ["TEXT/CSV", "text/csv"],
+        ["text/*", "text/csv"],
+        ["text/csv; charset=utf-8", "text/csv"],
+        ["application/json;q=0.5, text/csv", "text/csv"],
+        ["text/csv;q=0.5, application/json", "application/json"],
+        ["text/csv, application/json", "application/json"],
+        ["text/csv;q=0", "application/json"],
+        ["text/csv;q=invalid", "application/json"],
+        ["image/png", "application/json"],
+    ])
+    def test_negotiate_media_type(self, accept, expected_media_type):
+        self.assertEqual(expected_media_type, negotiate_media_type(accept))
+
+    def test_negotiate_media_type_when_package_is_missing(self):
+        with patch.dict("src.layers.python.helpers.response_factory.ENCODER_PACKAGES", {"text/csv": "missing"}):
+            self.assertEqual("application/json", negotiate_media_type("text/csv"))
+
+    @unittest.skipUnless(find_spec("msgpack"), "msgpack is not installed")
+    def test_build_response_when_msgpack(self):
+        import msgpack  # pylint: disable=import-outside-toplevel
+
+        response = build_response(
+            status=200,
+            body={"host": "domain.tld", "port": None},
+            media_type="application/msgpack"
+        )
+
+        self.assertEqual({"Content-Type": "application/msgpack"}, response["headers"])
+        self.assertTrue(response["isBase64Encoded"])
+        self.assertEqual({"host": "domain.tld", "port": None}, msgpack.unpackb(base64.b64decode(response["body"])))
+
+    @unittest.skipUnless(find_spec("cbor2"), "cbor2 is not installed")
+    def test_build_response_when_cbor(self):
+        import cbor2  # pylint: disable=import-outside-toplevel
+
+        response = build_response(status=200, body={"host": "domain.tld", "port": None}, media_type="application/cbor")
+
+        self.assertEqual({"Content-Type": "application/cbor"}, response["headers"])
+        self.assertTrue(response["isBase64Encoded"])
+        self.assertEqual({"host": "domain.tld", "port": None}, cbor2.loads(base64.b64decode(response["body"])))
+
+    @parameterized.expand([
+        [
+            {"host": "domain.tld", "port": None, "valid": True, "query_params": {"key": ["value"]}},
+            'host,port,valid,query_params\r\ndomain.tld,,true,"{""key"":[""value""]}"\r\n',
+        ],
+        [
+            {
+                "results": [
+                    {"status": 200, "result": {"host": "domain.tld", "port": 8080}},
+                    {"status": 400, "error": {"error": "Bad Request", "message": "Not a valid URI: a,b"}},
+                ]
+            },
+            "status,host,port,error,message\r\n200,domain.tld,8080,,\r\n400,,,Bad Request,\"Not a valid URI: a,b\"\r\n",
+        ],
+        [
+            {"aggregate": {"uris": 2, "invalid": 0, "keys": {"key": {"count": 1}}}},
+            'uris,invalid,keys\r\n2,0,"{""key"":{""count"":1}}"\r\n',
+        ],
+        [{"results": []}, "\r\n"],
+    ])
+    def test_build_response_when_csv(self, body, expected_body):
+        response = build_response(status=200, body=body, media_type="text/csv")
+
+        self.assertEqual({"Content-Type": "text/csv"}, response["headers"])
+        self.assertTrue(response["isBase64Encoded"])
+        self.assertEqual(expected_body, base64.b64decode(response["body"]).decode("utf-8"))
+
+    @parameterized.expand([
+        ["application/msgpack", "msgpack", "unpackb"],
+        ["application/cbor", "cbor2", "loads"],
+    ])
+    def test_build_response_when_binary_with_lone_surrogate(self, media_type, package, decode):
+        if not find_spec(package):
+            self.skipTest(f"{package} is not installed")
+        body = {"raw": json.loads('"http://domain.tld/\\ud800"'), "items": [json.loads('"\\udc00"')]}
+
+        response = build_response(status=200, body=body, media_type=media_type)
+
+        self.assertEqual(
+            {"raw": "http://domain.tld/\\ud800", "items": ["\\udc00"]},
+            getattr(import_module(package), decode)(base64.b64decode(response["body"]))
+        )
+
+    def test_build_response_when_csv_with_lone_surrogate(self):
+        body = {"results": [{"status": 200, "result": {"raw": json.loads('"http://domain.tld/\\ud800"')}}]}
+
+        response = build_response(status=200, body=body, media_type="text/csv")
+
+        self.assertEqual(
+            "status,raw\r\n200,http://domain.tld/\\ud800\r\n",
+            base64.b64decode(response["body"]).decode("utf-8")
+        )
+
+    def test_register_encoder(self):
+        self.addCleanup(ENCODERS.pop, "text/plain", None)
+
+        register_encoder(media_type="text/plain", encoder=lambda body: str(body).encode("utf-8"))
+
+        self.assertEqual("text/plain", negotiate_media_type("text/plain"))
+        self.assertEqual(
+            base64.b64encode(b"{'key': 'value'}").decode("ascii"),
+            build_response(status=200, body={"key": "value"}, media_type="text/plain")["body"]
+        )
+
+    @parameterized.expand([
+        ["application/json"],
+        ["text/csv"],
+    ])
+    def test_register_encoder_when_already_registered(self, media_type):
+        with self.assertRaises(ValueError) as error:
+            register_encoder(media_type=media_type, encoder=lambda body: b"")
+        self.assertEqual(f"Encoder already registered: {media_type}", str(error.exception))
+
 
 if __name__ == '__main__':
     unittest.main()
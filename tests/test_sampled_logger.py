@@ -0,0 +1,64 @@
+import logging
+import unittest
+from unittest.mock import MagicMock
+
+from src.layers.python.helpers.sampled_logger import SampledLogger
+
+
+class TestSampledLogger(unittest.TestCase):
+    def setUp(self):
+        self.logger = MagicMock()
+        self.logger.isEnabledFor.return_value = True
+        self.now = 0.0
+        self.sut = SampledLogger(logger=self.logger, rate=2.0, burst=3, clock=lambda: self.now)
+
+    def test_log_up_to_burst(self):
+        logged = [self.sut.error("Error: %s", index) for index in range(5)]
+
+        self.assertEqual([True, True, True, False, False], logged)
+        self.assertEqual(3, self.logger.log.call_count)
+        self.logger.log.assert_called_with(logging.ERROR, "Error: %s", 2)
+        self.assertEqual(2, self.sut.suppressed)
+
+    def test_log_reports_suppressed_records(self):
+        for index in range(5):
+            self.sut.warning("Error: %s", index)
+        self.now = 0.5
+
+        logged = self.sut.warning("Error: %s", 5)
+
+        self.assertTrue(logged)
+        self.logger.log.assert_called_with(logging.WARNING, "Error: %s (%d similar records suppressed)", 5, 2)
+        self.assertEqual(0, self.sut.suppressed)
+
+    def test_log_refills_up_to_burst(self):
+        for index in range(3):
+            self.sut.error("Error: %s", index)
+        self.now = 60.0
+
+        logged = [self.sut.error("Error: %s", index) for index in range(5)]
+
+        self.assertEqual([True, True, True, False, False], logged)
+
+    def test_log_when_level_is_disabled(self):
+        self.logger.isEnabledFor.return_value = False
+
+        self.assertFalse(self.sut.error("Error: %s", "any-error"))
+        self.logger.log.assert_not_called()
+        self.assertEqual(0, self.sut.suppressed)
+
+    def test_log_when_rate_is_zero(self):
+        sut = SampledLogger(logger=self.logger, rate=0, burst=1, clock=lambda: self.now)
+        self.now = 3600.0
+
+        self.assertEqual([True, False], [sut.error("Error"), sut.error("Error")])
+
+    def test_init_when_invalid(self):
+        with self.assertRaises(ValueError):
+            SampledLogger(logger=self.logger, rate=-1)
+        with self.assertRaises(ValueError):
+            SampledLogger(logger=self.logger, burst=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
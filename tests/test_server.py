@@ -0,0 +1,126 @@
+import asyncio
+import re
+import sys
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from parameterized import parameterized
+
+# Inject helpers packages (in production this is done via Lambda layer):
+sys.path.append("src/layers/python/")
+
+# pylint: disable-next=wrong-import-position
+from src.server import create_executor, serve  # noqa: E402
+
+
+class TestServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.executor = create_executor(workers=0)
+        self.server = await serve(host="127.0.0.1", port=0, executor=self.executor)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+        self.executor.shutdown()
+
+    async def _send(self, data: bytes) -> bytes:
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        writer.write(data)
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), timeout=5)
+        writer.close()
+        return response
+
+    @staticmethod
+    def _request(method: str, target: str, body: str = "", headers: str = "") -> bytes:
+        return (
+            f"{method} {target} HTTP/1.1\r\nHost: localhost\r\n{headers}Content-Length: {len(body.encode())}\r\n\r\n"
+            f"{body}"
+        ).encode()
+
+    async def test_parse(self):
+        response = await self._send(
+            self._request("POST", "/api/parse?pretty=false", '{"uri": "http://domain.tld"}', "Connection: close\r\n")
+        )
+
+        body = '{"fragment":null,"host":"domain.tld","port":null,"path":null,"query":null,' \
+               '"raw":"http://domain.tld","scheme":"http","userinfo":null,"kind":"url"}'
+        self.assertRegex(
+            response.decode(),
+            "^HTTP/1.1 200 OK\r\n"
+            "Content-Type: application/json\r\n"
+            'ETag: "[0-9a-f]{32}"\r\n'
+            "Cache-Control: no-cache\r\n"
+            "Vary: Accept\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n"
+            "\r\n"
+            f"{re.escape(body)}$"
+        )
+
+    async def test_keep_alive_and_pipelining(self):
+        response = await self._send(
+            self._request("POST", "/api/parse?pretty=false", '{"uri": "not-a-uri"}') +
+            self._request("POST", "/api/parse/batch?pretty=false", "127.0.0.1", "Content-Type: text/plain\r\n") +
+            self._request("GET", "/api/status", headers="Connection: close\r\n")
+        )
+
+        responses = response.decode().split("HTTP/1.1 ")[1:]
+        self.assertEqual(3, len(responses))
+        self.assertTrue(responses[0].startswith("400 Bad Request\r\n"))
+        self.assertIn("Connection: keep-alive\r\n", responses[0])
+        self.assertTrue(responses[0].endswith('"message":"Not a valid URI: not-a-uri"}'))
+        self.assertTrue(responses[1].startswith("200 OK\r\n"))
+        self.assertIn("Content-Type: application/x-ndjson\r\n", responses[1])
+        self.assertIn('"kind":"ipv4"', responses[1])
+        self.assertTrue(responses[2].startswith("200 OK\r\n"))
+        self.assertIn("Connection: close\r\n", responses[2])
+        self.assertIn("long live and prosper!", responses[2])
+
+    async def test_http_1_0_closes_connection(self):
+        response = await self._send(b"GET /api/status HTTP/1.0\r\n\r\n")
+
+        self.assertTrue(response.startswith(b"HTTP/1.1 200 OK\r\n"))
+        self.assertIn(b"Connection: close\r\n", response)
+
+    @parameterized.expand([
+        [b"GET /any-path HTTP/1.1\r\nConnection: close\r\n\r\n", b"HTTP/1.1 404 Not Found\r\n"],
+        [b"GET /api/parse HTTP/1.1\r\nConnection: close\r\n\r\n", b"HTTP/1.1 404 Not Found\r\n"],
+        [b"NOT-A-REQUEST\r\n\r\n", b"HTTP/1.1 400 Bad Request\r\n"],
+        [b"POST /api/parse HTTP/1.1\r\nContent-Length: any\r\n\r\n", b"HTTP/1.1 400 Bad Request\r\n"],
+        [
+            b"POST /api/parse HTTP/1.1\r\nContent-Length: -5\r\n\r\nGET /api/status HTTP/1.1\r\n\r\n",
+            b"HTTP/1.1 400 Bad Request\r\n"
+        ],
+        [b"POST /api/parse HTTP/1.1\r\nContent-Length: 99999999\r\n\r\n", b"HTTP/1.1 413 Request Entity Too Large\r\n"],
+        [b"POST /api/parse HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n", b"HTTP/1.1 501 Not Implemented\r\n"],
+        [b"GET /api/status HTTP/1.1\r\n" + b"X-Any: " + b"a" * 70000 + b"\r\n\r\n", b"HTTP/1.1 431 "]
+    ])
+    async def test_invalid_request(self, request, expected_status_line):
+        response = await self._send(request)
+
+        self.assertTrue(response.startswith(expected_status_line), response[:100])
+        self.assertEqual(1, response.count(b"HTTP/1.1 "))
+
+    async def test_incomplete_body(self):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        writer.write(b'POST /api/parse HTTP/1.1\r\nContent-Length: 100\r\n\r\n{"uri": ')
+        writer.write_eof()
+        response = await asyncio.wait_for(reader.read(), timeout=5)
+        writer.close()
+
+        self.assertTrue(response.startswith(b"HTTP/1.1 400 Bad Request\r\n"), response[:100])
+
+
+class TestCreateExecutor(unittest.TestCase):
+    @parameterized.expand([
+        [0, ThreadPoolExecutor],
+        [2, ProcessPoolExecutor],
+    ])
+    def test_create_executor(self, workers, expected_type):
+        with create_executor(workers=workers) as executor:
+            self.assertIsInstance(executor, expected_type)
+
+
+if __name__ == '__main__':
+    unittest.main()
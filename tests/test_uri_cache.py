@@ -0,0 +1,212 @@
+import sys
+import unittest
+from unittest.mock import patch
+from parameterized import parameterized
+
+from src.layers.python.helpers.uri_cache import create_redis_client, KeyValueCache, LruCache, MISSING
+from src.layers.python.helpers.uri_parser import ParsedUri, UriParser
+
+
+class FakeRedis:
+    # NOTE: In-process stand-in for a redis-py client, which can be taken down to simulate an outage.
+    def __init__(self):
+        self.data: dict[str, str] = {}
+        self.expirations: dict[str, int | None] = {}
+        self.calls: list[str] = []
+        self.available = True
+
+    def get(self, name: str) -> str | None:
+        self._call("get")
+        return self.data.get(name)
+
+    def mget(self, names: list[str]) -> list[str | None]:
+        self._call("mget")
+        return [self.data.get(name) for name in names]
+
+    def set(self, name: str, value: str | bytes, ex: int | None = None) -> None:
+        self._call("set")
+        # NOTE: As redis-py, which encodes the strings as UTF-8 (i.e. fails on lone surrogates).
+        if isinstance(value, str):
+            value.encode("utf-8")
+        self.data[name] = value
+        self.expirations[name] = ex
+
+    def _call(self, method: str) -> None:
+        self.calls.append(method)
+        if not self.available:
+            raise ConnectionError("Connection refused")
+
+
+class TestLruCache(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.sut = LruCache(max_size=2, ttl=10, clock=lambda: self.now)
+
+    @parameterized.expand([
+        [0],
+        [-1]
+    ])
+    def test_init_when_size_is_invalid(self, max_size):
+        with self.assertRaises(ValueError) as error:
+            LruCache(max_size=max_size)
+
+        self.assertEqual(f"Invalid cache size: {max_size}", str(error.exception))
+
+    def test_get_when_missing(self):
+        self.assertIs(MISSING, self.sut.get("any-key"))
+        self.assertEqual("any-default", self.sut.get("any-key", "any-default"))
+        self.assertEqual({"hits": 0, "misses": 2, "evictions": 0, "size": 0, "max_size": 2}, self.sut.stats())
+
+    def test_get_when_present(self):
+        self.sut.set("any-key", "any-value")
+
+        self.assertEqual("any-value", self.sut.get("any-key"))
+        self.assertEqual({"hits": 1, "misses": 0, "evictions": 0, "size": 1, "max_size": 2}, self.sut.stats())
+
+    def test_get_when_expired(self):
+        self.sut.set("any-key", "any-value")
+        self.now = 10.0
+
+        self.assertIs(MISSING, self.sut.get("any-key"))
+        self.assertEqual({"hits": 0, "misses": 1, "evictions": 1, "size": 0, "max_size": 2}, self.sut.stats())
+
+    def test_get_when_no_ttl(self):
+        sut = LruCache(max_size=2, clock=lambda: self.now)
+        sut.set("any-key", "any-value")
+        self.now = 1e9
+
+        self.assertEqual("any-value", sut.get("any-key"))
+
+    def test_set_evicts_least_recently_used(self):
+        self.sut.set("any-key-1", "any-value-1")
+        self.sut.set("any-key-2", "any-value-2")
+        self.sut.get("any-key-1")
+        self.sut.set("any-key-3", "any-value-3")
+
+        self.assertEqual("any-value-1", self.sut.get("any-key-1"))
+        self.assertIs(MISSING, self.sut.get("any-key-2"))
+        self.assertEqual("any-value-3", self.sut.get("any-key-3"))
+        self.assertEqual(1, self.sut.evictions)
+        self.assertEqual(2, len(self.sut))
+
+    def test_clear(self):
+        self.sut.set("any-key", "any-value")
+
+        self.sut.clear()
+
+        self.assertEqual(0, len(self.sut))
+
+    def test_get_many(self):
+        self.sut.set("any-key-1", "any-value-1")
+
+        self.assertEqual({"any-key-1": "any-value-1"}, self.sut.get_many(["any-key-1", "any-key-2"]))
+
+
+class TestKeyValueCache(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.client = FakeRedis()
+        self.sut = KeyValueCache(client=self.client, ttl=60, retry_after=30, clock=lambda: self.now)
+
+    def _create_other_container_cache(self) -> KeyValueCache:
+        return KeyValueCache(client=self.client, clock=lambda: self.now)
+
+    def test_get_when_set_by_other_container(self):
+        self.sut.set(("parse", "http://domain.tld"), (("host", "domain.tld"), ("port", None)))
+        other = self._create_other_container_cache()
+
+        self.assertEqual((("host", "domain.tld"), ("port", None)), other.get(("parse", "http://domain.tld")))
+        self.assertEqual((("host", "domain.tld"), ("port", None)), other.get(("parse", "http://domain.tld")))
+        self.assertEqual(["set", "get"], self.client.calls)
+        self.assertEqual([60], list(self.client.expirations.values()))
+        self.assertEqual({"hits": 1, "misses": 0, "errors": 0, "available": True}, {
+            name: value for name, value in other.stats().items() if name != "local"
+        })
+
+    def test_init_keeps_local_cache(self):
+        local = LruCache(max_size=5, ttl=60)
+
+        self.assertIs(local, KeyValueCache(client=self.client, local=local).local)
+
+    def test_get_when_missing(self):
+        self.assertIs(MISSING, self.sut.get("any-key"))
+        self.assertEqual("any-default", self.sut.get("any-key", "any-default"))
+        self.assertEqual(2, self.sut.misses)
+
+    def test_get_caches_none(self):
+        self.sut.set(("classify", "not-a-uri"), None)
+
+        self.assertIsNone(self._create_other_container_cache().get(("classify", "not-a-uri")))
+
+    def test_get_many_fetches_at_once(self):
+        self.sut.set("any-key-1", "any-value-1")
+        self.sut.set("any-key-2", "any-value-2")
+        other = self._create_other_container_cache()
+        other.local.set("any-key-1", "any-local-value-1")
+
+        values = other.get_many(["any-key-1", "any-key-2", "any-key-3", "any-key-2"])
+
+        self.assertEqual({"any-key-1": "any-local-value-1", "any-key-2": "any-value-2"}, values)
+        self.assertEqual(["set", "set", "mget"], self.client.calls)
+        self.assertEqual("any-value-2", other.local.get("any-key-2"))
+
+    def test_set_when_not_serializable(self):
+        parsed = ParsedUri.from_uri("http://domain.tld")
+
+        self.sut.set("any-key", parsed)
+
+        self.assertIs(parsed, self.sut.get("any-key"))
+        self.assertEqual({}, self.client.data)
+
+    def test_when_unavailable(self):
+        self.client.available = False
+
+        self.sut.set("any-key-1", "any-value-1")
+        self.assertEqual("any-value-1", self.sut.get("any-key-1"))
+        self.assertIs(MISSING, self.sut.get("any-key-2"))
+        self.assertEqual({}, self.sut.get_many(["any-key-2", "any-key-3"]))
+
+        # NOTE: The store is not called again until the retry delay is over.
+        self.assertEqual(["set"], self.client.calls)
+        self.assertEqual({"errors": 1, "available": False}, {
+            name: self.sut.stats()[name] for name in ("errors", "available")
+        })
+
+        self.client.available = True
+        self.now = 30.0
+        self.sut.set("any-key-2", "any-value-2")
+
+        self.assertEqual(["set", "set"], self.client.calls)
+        self.assertTrue(self.sut.stats()["available"])
+
+    def test_with_uri_parser(self):
+        UriParser(cache=self.sut).parse_valid("http://domain.tld")
+        other = UriParser(cache=self._create_other_container_cache())
+
+        with patch("src.layers.python.helpers.uri_parser.validators") as mock_validators:
+            other.prefetch(["http://domain.tld"])
+            result = other.parse_valid("http://domain.tld")
+
+        mock_validators.url.assert_not_called()
+        self.assertEqual("url", result["kind"])
+        self.assertEqual("domain.tld", result["host"])
+        self.assertEqual(["get", "set", "get", "set", "mget"], self.client.calls)
+
+    def test_clear_keeps_shared_entries(self):
+        self.sut.set("any-key", "any-value")
+
+        self.sut.clear()
+
+        self.assertEqual(0, len(self.sut))
+        self.assertEqual("any-value", self.sut.get("any-key"))
+
+    @patch.dict(sys.modules, {"redis": None})
+    def test_create_redis_client_when_not_installed(self):
+        with self.assertRaises(ImportError) as error:
+            create_redis_client(url="redis://localhost:6379")
+
+        self.assertEqual("The 'redis' package is required for a shared cache!", str(error.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
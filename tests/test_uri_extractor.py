@@ -0,0 +1,62 @@
+import unittest
+from random import Random
+from parameterized import parameterized
+
+from src.layers.python.helpers.uri_extractor import extract_uri_spans, MAX_CARRY_SIZE
+
+
+TEXT = (
+    '127.0.0.1 - - [10/Oct/2000:13:55:36 -0700] "GET /index.html HTTP/1.0" 200 2326 "http://domain.tld/start.html"\n'
+    "Contact john.doe@domain.tld or see (https://domain.tld/path?key=value), or [::1]:8080 and 10.0.0.0/8.\n"
+)
+
+
+class TestUriExtractor(unittest.TestCase):
+    @parameterized.expand([
+        ["see http://domain.tld.", ["http://domain.tld"]],
+        ["see http://domain.tld/path?key=value#fragment!", ["http://domain.tld/path?key=value#fragment"]],
+        ["(see http://domain.tld/path)", ["http://domain.tld/path"]],
+        ["see https://domain.tld/wiki/Name_(disambiguation)", ["https://domain.tld/wiki/Name_(disambiguation)"]],
+        ['<a href="http://domain.tld">', ["http://domain.tld"]],
+        ["see http://[::1]:8080/path", ["http://[::1]:8080/path"]],
+        ["mail user.name+tag@domain.tld, now", ["user.name+tag@domain.tld"]],
+        ["from 192.168.0.1:80 and 10.0.0.0/8", ["192.168.0.1", "10.0.0.0/8"]],
+        ["from fe80::1ff:fe23:4567:890a%eth0 and ::1", ["fe80::1ff:fe23:4567:890a%eth0", "::1"]],
+        ["version 1.2.3.4.5 and a.b@c", []],
+        ["at 12:30:45 or [10/Oct/2000:13:55:36 -0700] from 1:2:3:4:5:6:7:8", ["1:2:3:4:5:6:7:8"]],
+        ["", []],
+    ])
+    def test_extract_uri_spans(self, text, expected_uris):
+        spans = list(extract_uri_spans([text]))
+
+        self.assertEqual(expected_uris, [uri for _, _, uri in spans])
+        for start, end, uri in spans:
+            self.assertEqual(uri, text[start:end])
+
+    def test_extract_uri_spans_is_same_whatever_the_chunks(self):
+        expected_spans = list(extract_uri_spans([TEXT]))
+        random = Random(42)
+
+        for chunk_size in [1, 2, 3, 7, 64, random.randint(1, 100), len(TEXT)]:
+            chunks = [TEXT[start:start + chunk_size] for start in range(0, len(TEXT), chunk_size)]
+            self.assertEqual(expected_spans, list(extract_uri_spans(chunks)), f"chunk size {chunk_size}")
+
+    def test_extract_uri_spans_does_not_carry_huge_tokens(self):
+        token = "a" * (MAX_CARRY_SIZE + 1)
+        chunks = [token, " http://domain.tld"]
+
+        self.assertEqual(
+            [(MAX_CARRY_SIZE + 2, MAX_CARRY_SIZE + 19, "http://domain.tld")],
+            list(extract_uri_spans(chunks))
+        )
+
+    def test_extract_uri_spans_is_lazy(self):
+        def chunks():
+            yield "http://domain.tld "
+            raise AssertionError("The next chunk should not be read")
+
+        self.assertEqual((0, 17, "http://domain.tld"), next(extract_uri_spans(chunks())))
+
+
+if __name__ == '__main__':
+    unittest.main()